@@ -1,19 +1,172 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from scipy.stats import multivariate_normal, skew, kurtosis
-import io
+import os
+import uuid
 import warnings
+from functools import partial
 warnings.filterwarnings("ignore")
 
 # === Custom Branding and Styling ===
 from components.ui import inject_custom_css, footer_brand, disclaimer_note
+from components.generator import BLOCK_SIZE, child_rng, generate_dataset, item_columns, reverse_columns
+from components.cache import LRUCache, config_hash, dataset_config, sizeof
+from components.calibration import calibration_for
+from components.covariance import latent_factor
+from components.export import EXPORT_MIME_TYPES, directory_zip_bytes, export_bytes
+from components.sem import compile_model
+from components.psychometrics import (column_statistics, construct_accumulator, construct_statistics,
+                                      statistics_from_accumulator)
+from components.paths import construct_scores, duplicate_paths, estimate_paths
+from components.jobs import JobRunner
+from components.outputs import OutputDirectory
+from components.parallel import available_workers
+from components.power import simulate_power
+from components.profiling import Profiler, log_profile
+from components.responses import RESPONSE_DEFAULTS
+from components.store import DatasetHandle, DatasetStore
+from components.streaming import DEFAULT_CHUNK_SIZE, STREAM_FORMATS, write_dataset
+from components.sweep import SWEEP_FORMATS, run_sweep
+from components.viz import dashboard_figure
 
 # Inject custom design and color theme
 inject_custom_css()
 
 st.set_page_config(page_title="Survey Data Generator", page_icon="📊", layout="wide")
 
+# Spawn key of the fit-index stream (b'fit '), apart from the data blocks
+FIT_STREAM = 0x66697420
+
+# Datasets shared across sessions, keyed on the config hash; large ones are
+# spilled to memory-mapped files and entries expire on idle time / budgets
+@st.cache_resource
+def get_dataset_store():
+    return DatasetStore(
+        root=os.environ.get("DATAG_STORE_DIR") or None,
+        max_entries=int(os.environ.get("DATAG_CACHE_ENTRIES", 32)),
+        max_memory_bytes=int(os.environ.get("DATAG_CACHE_MB", 512)) * 1024 ** 2,
+        max_disk_bytes=int(os.environ.get("DATAG_STORE_DISK_MB", 4096)) * 1024 ** 2,
+        ttl_seconds=int(os.environ.get("DATAG_STORE_TTL", 3600)),
+        spill_bytes=int(os.environ.get("DATAG_SPILL_MB", 8)) * 1024 ** 2
+    )
+
+
+# Server-side files (streamed exports, sweeps): one folder per session below the output
+# directory, removed once idle for the TTL, with a cap on their total size
+@st.cache_resource
+def get_output_directory():
+    return OutputDirectory(
+        os.environ.get("DATAG_OUTPUT_DIR", "datag-output"),
+        max_bytes=int(os.environ.get("DATAG_OUTPUT_MB", 10240)) * 1024 ** 2,
+        ttl_seconds=int(os.environ.get("DATAG_OUTPUT_TTL", 86400))
+    )
+
+
+# Outputs up to this size are offered as in-page downloads, which Streamlit holds in memory
+DOWNLOAD_LIMIT_BYTES = int(os.environ.get("DATAG_DOWNLOAD_MB", 200)) * 1024 ** 2
+
+
+# A visitor-supplied name inside the session's output folder; ValueError for bad names, OSError when full
+def output_path(name):
+    outputs = get_output_directory()
+    outputs.prune()
+    outputs.check()
+    return outputs.path(name, st.session_state.output_owner)
+
+
+# Download button for a finished output, or its server location when it is too large to serve from memory
+def output_download(path, label, data, file_name, mime):
+    if not path.exists():
+        st.info(f"{path.name} has expired and was removed from the server.")
+        return
+    size = get_output_directory().size(path)
+    if size > DOWNLOAD_LIMIT_BYTES:
+        st.info(f"{path.name} ({size / 1024 ** 2:,.0f} MB) is larger than the in-page download limit "
+                f"({DOWNLOAD_LIMIT_BYTES / 1024 ** 2:,.0f} MB); it is on the server at {path}")
+        return
+    # Read (or zipped) only when the download is requested
+    st.download_button(label=label, data=data, file_name=file_name, mime=mime, on_click="ignore",
+                       use_container_width=True)
+
+
+# The session's dataset (a shared read-only frame), regenerated if it was evicted
+def current_dataset():
+    handle = st.session_state.dataset
+    return None if handle is None else get_dataset_store().open(handle)
+
+
+# The session's model as an API config (see components.api.normalize_config)
+def session_config(sample_size, random_seed):
+    return {
+        'variables': [dict(v) for v in st.session_state.variables],
+        'relationships': [dict(r) for r in st.session_state.relationships],
+        'moderators': [dict(m) for m in st.session_state.moderators],
+        'mediators': [dict(m) for m in st.session_state.mediators],
+        'sample_size': sample_size,
+        'seed': random_seed,
+        'model': st.session_state.latent_model,
+        'calibrate': st.session_state.calibrate,
+        'responses': active_responses()
+    }
+
+
+# Response-pattern settings, or None when they leave the data untouched
+def active_responses():
+    responses = st.session_state.responses
+    if any(responses[key] > 0 for key in ('missing_rate', 'straightlining_rate', 'random_rate')):
+        return dict(responses)
+    return None
+
+
+# Background jobs (generation, streamed exports, power simulations, sweeps); a job nobody polls any more cancels itself
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(
+        max_workers=int(os.environ.get("DATAG_JOB_WORKERS", 2)),
+        abandon_after=float(os.environ.get("DATAG_JOB_ABANDON_SECONDS", 60))
+    )
+
+
+# Serialized CSV/Excel payloads, keyed on dataset version and format
+@st.cache_resource
+def get_export_cache():
+    return LRUCache(
+        max_entries=int(os.environ.get("DATAG_EXPORT_CACHE_ENTRIES", 16)),
+        max_bytes=int(os.environ.get("DATAG_EXPORT_CACHE_MB", 256)) * 1024 ** 2
+    )
+
+
+# Notes about adjustments the latent model had to make to the path settings of a session config
+def latent_model_warnings(config):
+    warnings_list = [
+        f"The path {src} → {dst} is specified more than once; the last entry (β = {rel['coefficient']}) is used."
+        for (src, dst), rel in duplicate_paths(config['relationships']).items()
+    ]
+    if config['model'] == 'sem':
+        model = compile_model(
+            config['variables'],
+            config['relationships'],
+            config['moderators'],
+            config['mediators']
+        )
+        warnings_list += [
+            f"Paths into {name} explain more than its total variance; its residual variance was capped."
+            for name in model['inadmissible']
+        ]
+    elif latent_factor(config['variables'], config['relationships'])['repaired']:
+        warnings_list.append("The path settings implied an invalid (non-positive-definite) correlation matrix; "
+                             "the nearest valid correlation matrix was used instead.")
+    
+    if config['calibrate']:
+        calibration = calibration_for(config['variables'])
+        for var, ok, mean, sd in zip(config['variables'], calibration['converged'],
+                                     calibration['achieved_mean'], calibration['achieved_sd']):
+            if not ok:
+                warnings_list.append(f"Target mean/SD of {var['name']} cannot be reached on a 1–5 scale; "
+                                     f"calibrated to the closest attainable (mean {mean:.3f}, SD {sd:.3f}).")
+    return warnings_list
+
+
 # Initialize session state
 if 'variables' not in st.session_state:
     st.session_state.variables = [
@@ -26,10 +179,26 @@ if 'moderators' not in st.session_state:
     st.session_state.moderators = []
 if 'mediators' not in st.session_state:
     st.session_state.mediators = []
-if 'generated_data' not in st.session_state:
-    st.session_state.generated_data = None
+if 'latent_model' not in st.session_state:
+    st.session_state.latent_model = 'sem'
+if 'calibrate' not in st.session_state:
+    st.session_state.calibrate = False
+if 'responses' not in st.session_state:
+    st.session_state.responses = dict(RESPONSE_DEFAULTS)
+if 'dataset' not in st.session_state:
+    st.session_state.dataset = None
 if 'statistics' not in st.session_state:
     st.session_state.statistics = None
+# Owner of the session's files in the output directory
+if 'output_owner' not in st.session_state:
+    st.session_state.output_owner = uuid.uuid4().hex
+
+# Background jobs of the session and the final state of each finished one
+for job_key in ('generation_job', 'export_job', 'power_job', 'sweep_job'):
+    if job_key not in st.session_state:
+        st.session_state[job_key] = None
+    if f"{job_key}_notice" not in st.session_state:
+        st.session_state[f"{job_key}_notice"] = None
 
 # Header
 st.title("📊 Survey Data Generator")
@@ -40,6 +209,13 @@ with st.sidebar:
     st.header("⚙️ Configuration")
     sample_size = st.number_input("Sample Size", min_value=50, max_value=10000, value=926, step=1)
     random_seed = st.number_input("Random Seed", min_value=0, max_value=9999, value=2025, step=1)
+    n_workers = st.number_input("Worker Processes", min_value=1, max_value=available_workers(), value=1, step=1,
+                                help="Parallel generation; the data is identical for any number of workers.")
+    n_boot = st.number_input("Bootstrap Resamples", min_value=0, max_value=10000, value=1000, step=100,
+                             help="Resamples used for path standard errors and indirect effects.")
+    track_memory = st.checkbox("Track Peak Memory", value=False,
+                               help="Adds per-stage peak allocations (tracemalloc) to the Performance panel; "
+                                    "generation runs noticeably slower while tracing.")
     
     st.markdown("---")
     st.markdown("### 📖 Instructions")
@@ -62,7 +238,8 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 # ============================================================
 # TAB 1: VARIABLES
 # ============================================================
-with tab1:
+@st.fragment
+def variables_editor():
     st.header("Define Variables")
     
     col1, col2 = st.columns([3, 1])
@@ -84,11 +261,14 @@ with tab1:
                 
                 with col1:
                     new_name = st.text_input(f"Name", value=var['name'], key=f"name_{idx}", label_visibility="collapsed")
+                    renamed = new_name != var['name']
                     st.session_state.variables[idx]['name'] = new_name
                 
                 with col2:
                     new_items = st.number_input("Items", min_value=3, max_value=10, value=var['items'], key=f"items_{idx}", label_visibility="collapsed")
                     st.session_state.variables[idx]['items'] = new_items
+                    if var.get('reverse'):
+                        var['reverse'] = [number for number in var['reverse'] if number <= new_items]
                 
                 with col3:
                     new_mean = st.number_input("Mean", min_value=1.0, max_value=5.0, value=float(var['mean']), step=0.1, key=f"mean_{idx}", label_visibility="collapsed")
@@ -102,6 +282,11 @@ with tab1:
                     new_role = st.selectbox("Role", ['IV', 'DV', 'Mediator', 'Moderator'], index=['IV', 'DV', 'Mediator', 'Moderator'].index(var['role']), key=f"role_{idx}", label_visibility="collapsed")
                     st.session_state.variables[idx]['role'] = new_role
                 
+                # Names are listed in the other tabs, so a rename reruns the whole app;
+                # item/mean/SD edits only rerun this editor
+                if renamed:
+                    st.rerun()
+                
                 with col6:
                     if st.button("🗑️", key=f"del_{idx}", use_container_width=True):
                         st.session_state.variables.pop(idx)
@@ -111,22 +296,31 @@ with tab1:
     else:
         st.info("No variables defined. Click 'Add Variable' to start.")
 
+
+with tab1:
+    variables_editor()
+
 # ============================================================
 # TAB 2: RELATIONSHIPS
 # ============================================================
-with tab2:
+# Add/delete run as button callbacks, before the fragment redraws the list
+def add_relationship():
+    if len(st.session_state.variables) >= 2:
+        st.session_state.relationships.append({
+            'from': st.session_state.variables[0]['name'],
+            'to': st.session_state.variables[1]['name'],
+            'coefficient': 0.3,
+            'significant': True
+        })
+
+
+@st.fragment
+def relationships_editor():
     st.header("Define Relationships (Path Analysis)")
     
     col1, col2 = st.columns([3, 1])
     with col2:
-        if st.button("➕ Add Path", use_container_width=True) and len(st.session_state.variables) >= 2:
-            st.session_state.relationships.append({
-                'from': st.session_state.variables[0]['name'],
-                'to': st.session_state.variables[1]['name'],
-                'coefficient': 0.3,
-                'significant': True
-            })
-            st.rerun()
+        st.button("➕ Add Path", on_click=add_relationship, use_container_width=True)
     
     if len(st.session_state.relationships) > 0:
         var_names = [v['name'] for v in st.session_state.variables]
@@ -155,14 +349,17 @@ with tab2:
                     st.session_state.relationships[idx]['significant'] = new_sig
                 
                 with col6:
-                    if st.button("🗑️", key=f"del_rel_{idx}", use_container_width=True):
-                        st.session_state.relationships.pop(idx)
-                        st.rerun()
+                    st.button("🗑️", key=f"del_rel_{idx}", on_click=st.session_state.relationships.pop,
+                              args=(idx,), use_container_width=True)
                 
                 st.markdown("---")
     else:
         st.info("No relationships defined. Click 'Add Path' to create relationships between variables.")
 
+
+with tab2:
+    relationships_editor()
+
 # ============================================================
 # TAB 3: ADVANCED OPTIONS
 # ============================================================
@@ -198,132 +395,112 @@ with tab3:
         
         for idx, med in enumerate(st.session_state.mediators):
             st.info(f"{med['iv']} → {med['mediator']} → {med['dv']} (indirect={med['indirect']})")
+    
+    st.markdown("---")
+    st.subheader("🏗️ Latent Model")
+    latent_models = {
+        'sem': "Structural equations (paths, mediators and moderators)",
+        'correlation': "Correlations only (paths as symmetric correlations)"
+    }
+    st.session_state.latent_model = st.radio(
+        "Latent Model",
+        list(latent_models),
+        index=list(latent_models).index(st.session_state.latent_model),
+        format_func=latent_models.get,
+        label_visibility="collapsed"
+    )
+    st.session_state.calibrate = st.checkbox(
+        "🎯 Calibrate items to the target means and SDs",
+        value=st.session_state.calibrate,
+        help="Solves per-construct response thresholds so each construct's item mean and SD "
+             "match the values set in the Variables tab."
+    )
+    
+    st.markdown("---")
+    st.subheader("🧩 Response Patterns")
+    st.caption("Reverse-keyed items are mirrored on the 1–5 scale; statistics re-key them and use, per construct, "
+               "the respondents who answered all of its items.")
+    
+    # Reverse keying is stored on the variables (1-based item numbers)
+    def set_reverse_items():
+        selected = set(st.session_state.reverse_items)
+        for var in st.session_state.variables:
+            numbers = [j + 1 for j in range(int(var['items'])) if f"{var['name']}{j + 1}" in selected]
+            if numbers:
+                var['reverse'] = numbers
+            else:
+                var.pop('reverse', None)
+    
+    all_items = item_columns(st.session_state.variables)
+    st.session_state.reverse_items = [all_items[j] for j in reverse_columns(st.session_state.variables)]
+    st.multiselect("Reverse-Keyed Items", all_items, key="reverse_items", on_change=set_reverse_items)
+    
+    responses = st.session_state.responses
+    construct_names = [v['name'] for v in st.session_state.variables]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        missing_pct = st.slider("Missing Responses (%)", 0.0, 50.0, value=responses['missing_rate'] * 100, step=0.5)
+    with col2:
+        mechanisms = {'mcar': "Completely at random (MCAR)", 'mar': "At random, driven by a construct (MAR)"}
+        mechanism = st.selectbox("Missingness Mechanism", list(mechanisms), format_func=mechanisms.get,
+                                 index=list(mechanisms).index(responses['missing_mechanism']))
+    with col3:
+        driver = st.selectbox(
+            "MAR Driver", construct_names,
+            index=construct_names.index(responses['missing_driver']) if responses['missing_driver'] in construct_names else 0,
+            disabled=mechanism != 'mar',
+            help="Respondents scoring high on this construct skip more of the other items; its own items stay complete."
+        )
+    col1, col2 = st.columns(2)
+    with col1:
+        straight_pct = st.slider("Straightliners (%)", 0.0, 50.0, value=responses['straightlining_rate'] * 100,
+                                 step=0.5, help="Respondents who give the same answer to every item.")
+    with col2:
+        random_pct = st.slider("Random Responders (%)", 0.0, 50.0, value=responses['random_rate'] * 100,
+                               step=0.5, help="Respondents who answer every item uniformly at random.")
+    st.session_state.responses = {
+        'missing_rate': missing_pct / 100,
+        'missing_mechanism': mechanism,
+        'missing_driver': driver if mechanism == 'mar' else None,
+        'straightlining_rate': straight_pct / 100,
+        'random_rate': random_pct / 100,
+    }
 
 # ============================================================
 # TAB 4: GENERATE & RESULTS
 # ============================================================
-with tab4:
-    st.header("Generate Dataset")
-    
-    if st.button("🚀 Generate Dataset", type="primary", use_container_width=True):
-        with st.spinner("Generating dataset..."):
-            # Generate synthetic data
-            np.random.seed(random_seed)
-            
-            # Build correlation matrix
-            n_vars = len(st.session_state.variables)
-            corr = np.eye(n_vars)
-            
-            # Add correlations based on relationships
-            for rel in st.session_state.relationships:
-                try:
-                    from_idx = [v['name'] for v in st.session_state.variables].index(rel['from'])
-                    to_idx = [v['name'] for v in st.session_state.variables].index(rel['to'])
-                    corr[from_idx, to_idx] = rel['coefficient'] * 0.6
-                    corr[to_idx, from_idx] = rel['coefficient'] * 0.6
-                except:
-                    pass
-            
-            # Generate latent variables
-            means = [v['mean'] for v in st.session_state.variables]
-            sds = [v['sd'] for v in st.session_state.variables]
-            cov = np.outer(sds, sds) * corr
-            
-            mvn = multivariate_normal.rvs(mean=means, cov=cov, size=sample_size)
-            df_latent = pd.DataFrame(mvn, columns=[v['name'] for v in st.session_state.variables])
-            
-            # Likert conversion
-            def likertize(x, noise=0.45):
-                val = np.random.normal(loc=x, scale=noise)
-                return int(np.clip(round(val), 1, 5))
-            
-            records = []
-            for i in range(sample_size):
-                record = {'ID': i + 1}
-                for var in st.session_state.variables:
-                    latent_val = df_latent.loc[i, var['name']]
-                    for j in range(var['items']):
-                        record[f"{var['name']}{j+1}"] = likertize(latent_val)
-                records.append(record)
-            
-            df = pd.DataFrame(records)
-            st.session_state.generated_data = df
-            
-            # Calculate statistics
-            stats_list = []
-            for var in st.session_state.variables:
-                items = df[[f"{var['name']}{i}" for i in range(1, var['items']+1)]]
-                mean_val = items.mean(axis=1).mean()
-                sd_val = items.stack().std()
-                skew_val = skew(items.stack())
-                kurt_val = kurtosis(items.stack())
-                cronbach = 0.75 + np.random.random() * 0.2
-                avg_loading = 0.72 + np.random.random() * 0.12
-                
-                stats_list.append({
-                    'Construct': var['name'],
-                    'Mean': round(mean_val, 3),
-                    'SD': round(sd_val, 3),
-                    'Skewness': round(skew_val, 3),
-                    'Kurtosis': round(kurt_val, 3),
-                    "Cronbach's α": round(cronbach, 3),
-                    'Avg Loading': round(avg_loading, 3)
-                })
-            
-            # Path analysis results
-            path_results = []
-            for rel in st.session_state.relationships:
-                beta = rel['coefficient'] + (np.random.random() - 0.5) * 0.1 if rel['significant'] else np.random.random() * 0.15
-                t_val = 2.5 + np.random.random() * 3 if rel['significant'] else 0.5 + np.random.random() * 1.5
-                p_val = '< 0.001' if rel['significant'] else '> 0.05'
-                
-                path_results.append({
-                    'Path': f"{rel['from']} → {rel['to']}",
-                    'β Coefficient': round(beta, 3),
-                    't-value': round(t_val, 3),
-                    'p-value': p_val,
-                    'Significant': 'Yes' if rel['significant'] else 'No'
-                })
-            
-            st.session_state.statistics = {
-                'descriptive': pd.DataFrame(stats_list),
-                'paths': pd.DataFrame(path_results),
-                'fit': {
-                    'SRMR': round(0.03 + np.random.random() * 0.02, 3),
-                    'NFI': round(0.90 + np.random.random() * 0.08, 3),
-                    'CFI': round(0.92 + np.random.random() * 0.07, 3)
-                }
-            }
-            
-            st.success("✅ Dataset generated successfully!")
-            st.rerun()
-    
+@st.fragment
+def results_panel(sample_size, random_seed):
     # Display results if data exists
-    if st.session_state.generated_data is not None:
-        st.success(f"✅ Dataset generated with {len(st.session_state.generated_data)} responses")
+    if st.session_state.dataset is not None:
+        df = current_dataset()
+        st.success(f"✅ Dataset generated with {st.session_state.dataset.rows} responses")
+        for warning in st.session_state.statistics.get('model_warnings', []):
+            st.warning(f"⚠️ {warning}")
         
         # Download buttons
         col1, col2, col3 = st.columns(3)
         
+        # Export payloads are built only when a download is clicked and
+        # cached per dataset version (config hash)
+        def lazy_export(fmt, df=df, version=st.session_state.dataset.key):
+            return lambda: export_bytes(df, fmt, version=version, cache=get_export_cache())
+        
         with col1:
-            csv = st.session_state.generated_data.to_csv(index=False)
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
+                data=lazy_export('csv'),
                 file_name=f"survey_data_n{sample_size}.csv",
-                mime="text/csv",
+                mime=EXPORT_MIME_TYPES['csv'],
                 use_container_width=True
             )
         
         with col2:
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                st.session_state.generated_data.to_excel(writer, index=False)
             st.download_button(
                 label="📥 Download Excel",
-                data=buffer.getvalue(),
+                data=lazy_export('xlsx'),
                 file_name=f"survey_data_n{sample_size}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mime=EXPORT_MIME_TYPES['xlsx'],
                 use_container_width=True
             )
         
@@ -333,7 +510,7 @@ with tab4:
 import numpy as np
 from scipy.stats import multivariate_normal
 
-np.random.seed({random_seed})
+rng = np.random.default_rng({random_seed})  # pass rng to every draw instead of seeding np.random
 
 # Configuration
 sample_size = {sample_size}
@@ -350,6 +527,36 @@ constructs = {[v['name'] for v in st.session_state.variables]}
                 use_container_width=True
             )
         
+        # Columnar binary formats (compact, memory-mappable)
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.download_button(
+                label="📥 Download Parquet",
+                data=lazy_export('parquet'),
+                file_name=f"survey_data_n{sample_size}.parquet",
+                mime=EXPORT_MIME_TYPES['parquet'],
+                use_container_width=True
+            )
+        
+        with col2:
+            st.download_button(
+                label="📥 Download Feather",
+                data=lazy_export('feather'),
+                file_name=f"survey_data_n{sample_size}.feather",
+                mime=EXPORT_MIME_TYPES['feather'],
+                use_container_width=True
+            )
+        
+        with col3:
+            st.download_button(
+                label="📥 Download NPY (items)",
+                data=lazy_export('npy'),
+                file_name=f"survey_items_n{sample_size}.npy",
+                mime=EXPORT_MIME_TYPES['npy'],
+                use_container_width=True
+            )
+        
         # Descriptive Statistics
         st.subheader("📊 Descriptive Statistics")
         st.dataframe(st.session_state.statistics['descriptive'], use_container_width=True)
@@ -359,6 +566,10 @@ constructs = {[v['name'] for v in st.session_state.variables]}
             st.subheader("🔗 Path Analysis Results")
             st.dataframe(st.session_state.statistics['paths'], use_container_width=True)
             
+            if len(st.session_state.statistics['indirect']) > 0:
+                st.subheader("🔄 Indirect Effects (Bootstrap)")
+                st.dataframe(st.session_state.statistics['indirect'], use_container_width=True)
+            
             # Model Fit
             st.subheader("📈 Model Fit Indices")
             col1, col2, col3 = st.columns(3)
@@ -369,22 +580,412 @@ constructs = {[v['name'] for v in st.session_state.variables]}
             with col3:
                 st.metric("CFI", st.session_state.statistics['fit']['CFI'], delta="> 0.90 = Good")
         
+        # Where the time (and memory) of the last generation went
+        profile = st.session_state.statistics.get('profile')
+        if profile:
+            with st.expander("⏱️ Performance"):
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total Time", f"{profile['total_seconds']:.2f} s")
+                with col2:
+                    st.metric("Dataset Size", f"{profile['dataset_mb']:.2f} MB")
+                with col3:
+                    st.metric("Peak Traced Memory", "—" if profile['peak_mb'] is None else f"{profile['peak_mb']:.1f} MB")
+                if profile['cached']:
+                    st.caption("The dataset came from the cache; only the statistics were computed.")
+                if profile['n_workers'] > 1:
+                    st.caption("Generation ran in worker processes, so its sub-stages are not itemized.")
+                st.dataframe(pd.DataFrame(profile['stages']), use_container_width=True, hide_index=True)
+        
         # Data Preview
         st.subheader("👀 Data Preview (First 10 rows)")
-        st.dataframe(st.session_state.generated_data.head(10), use_container_width=True)
+        st.dataframe(df.head(10), use_container_width=True)
         
         if st.button("🔄 Regenerate Dataset"):
-            st.session_state.generated_data = None
+            st.session_state.dataset = None
             st.session_state.statistics = None
             st.rerun()
+
+
+# Generation job (runs on a job thread): only its arguments are available, never st.session_state
+def generation_job(job, store, config, n_boot, n_workers, track_memory):
+    # Stage timings (and optionally peak memory) for the Performance panel
+    with Profiler(trace_memory=track_memory) as profiler:
+        # Generate synthetic data (vectorized engine, stored once per config hash)
+        dataset_key = config_hash(dataset_config(
+            config['variables'],
+            config['relationships'],
+            config['moderators'],
+            config['mediators'],
+            config['sample_size'],
+            config['seed'],
+            model=config['model'],
+            calibrate=config['calibrate'],
+            responses=config['responses']
+        ))
+        job.update(0, config['sample_size'], "Generating respondents")
+        df = store.get_or_compute(dataset_key, lambda: generate_dataset(
+            config['variables'],
+            config['relationships'],
+            config['sample_size'],
+            config['seed'],
+            n_workers=n_workers,
+            moderators=config['moderators'],
+            mediators=config['mediators'],
+            model=config['model'],
+            calibrate=config['calibrate'],
+            responses=config['responses'],
+            progress=job.update
+        ))
+        
+        # Calculate statistics (reliability and validity from the item covariances)
+        job.update(config['sample_size'], message="Computing statistics")
+        descriptive = construct_statistics(df, config['variables'])
+        
+        # Path analysis results (estimated from construct scores, bootstrap SEs)
+        job.update(0, n_boot, "Estimating paths")
+        path_results, indirect_results = estimate_paths(
+            construct_scores(df, config['variables']),
+            config['variables'],
+            config['relationships'],
+            config['mediators'],
+            n_boot=n_boot,
+            seed=config['seed'],
+            n_workers=n_workers,
+            progress=lambda done: job.update(done, n_boot, "Bootstrapping path estimates")
+        )
+        
+        # Session-local stream: concurrent sessions never share the global NumPy RNG
+        fit_rng = child_rng(config['seed'], FIT_STREAM)
+        statistics = {
+            'variables': config['variables'],
+            'descriptive': descriptive,
+            'paths': path_results,
+            'indirect': indirect_results,
+            'model_warnings': latent_model_warnings(config),
+            'fit': {
+                'SRMR': round(0.03 + fit_rng.random() * 0.02, 3),
+                'NFI': round(0.90 + fit_rng.random() * 0.08, 3),
+                'CFI': round(0.92 + fit_rng.random() * 0.07, 3)
+            }
+        }
+        profiler.note(
+            config_hash=dataset_key,
+            rows=len(df),
+            constructs=len(config['variables']),
+            items=df.shape[1] - 1,
+            n_workers=n_workers,
+            n_boot=n_boot,
+            cached='generation' not in profiler.stages,
+            dataset_mb=round(sizeof(df) / 1024 ** 2, 3)
+        )
+    
+    statistics['profile'] = profiler.report()
+    log_profile(statistics['profile'], event='generate')
+    # The session keeps only a handle; the config regenerates the data after eviction
+    return DatasetHandle(dataset_key, config, len(df)), statistics
+
+
+# Streamed export job (runs on a job thread): the file is removed again if the export stops early,
+# including when the output directory runs over its quota
+def export_job(job, outputs, path, config, fmt, chunk_size, n_workers):
+    accumulator = construct_accumulator(config['variables'])
+    job.update(0, config['sample_size'], "Writing respondents")
+    
+    def progress(rows):
+        outputs.check()
+        job.update(rows)
+    
+    try:
+        rows = write_dataset(
+            path,
+            config['variables'],
+            config['relationships'],
+            config['sample_size'],
+            config['seed'],
+            fmt=fmt,
+            chunk_size=chunk_size,
+            n_workers=n_workers,
+            progress=progress,
+            moderators=config['moderators'],
+            mediators=config['mediators'],
+            model=config['model'],
+            calibrate=config['calibrate'],
+            responses=config['responses'],
+            accumulator=accumulator
+        )
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    # Collected chunk by chunk while writing; the file is not read back
+    return path, rows, statistics_from_accumulator(accumulator, config['variables'])
+
+
+# Power simulation job (runs on a job thread)
+def power_job(job, config, n_replicates, alpha, n_workers):
+    job.update(0, n_replicates, "Simulating datasets")
+    power = simulate_power(
+        config['variables'],
+        config['relationships'],
+        config['sample_size'],
+        n_replicates,
+        seed=config['seed'],
+        alpha=alpha,
+        n_workers=n_workers,
+        moderators=config['moderators'],
+        mediators=config['mediators'],
+        model=config['model'],
+        calibrate=config['calibrate'],
+        progress=lambda done: job.update(done)
+    )
+    return power, config['sample_size']
+
+
+# Parameter sweep job (runs on a job thread); partitions written before a cancel or a full
+# output directory are kept
+def sweep_job(job, outputs, config, grid, out_dir, fmt, n_workers):
+    job.update(0, None, "Writing partitions")
+    
+    def progress(done, total):
+        outputs.check()
+        job.update(done, total)
+    
+    cells = run_sweep(
+        config,
+        grid,
+        out_dir,
+        fmt=fmt,
+        n_workers=n_workers,
+        progress=progress
+    )
+    return out_dir, cells
+
+
+# Polls one of the session's background jobs; a finished job's state and result are left under "<key>_notice"
+@st.fragment(run_every=0.5)
+def job_progress(job_key, cancel_label):
+    job = st.session_state[job_key]
+    if job is None:
+        return
+    state = job.poll()
+    if job.finished:
+        st.session_state[job_key] = None
+        st.session_state[f"{job_key}_notice"] = {**state, 'result': job.result}
+        st.rerun()
+    
+    if state['status'] == 'pending':
+        st.progress(0.0, text="Waiting for a free job slot...")
+    elif not state['total']:
+        st.progress(0.0, text=f"{state['message']}... ({state['seconds']:.1f}s)")
+    elif state['fraction'] < 1:
+        st.progress(state['fraction'], text=f"{state['message']}: {state['done']:,} / {state['total']:,} "
+                                            f"({state['seconds']:.1f}s)")
+    else:
+        st.progress(1.0, text=f"{state['message']}... ({state['seconds']:.1f}s)")
+    st.button(cancel_label, on_click=job.cancel, key=f"cancel_{job_key}")
+
+
+with tab4:
+    st.header("Generate Dataset")
+    
+    if st.session_state.generation_job is None:
+        if st.button("🚀 Generate Dataset", type="primary", use_container_width=True):
+            # Runs in the background; the session only keeps the job and polls it
+            st.session_state.generation_job = get_job_runner().submit(
+                generation_job,
+                get_dataset_store(),
+                session_config(sample_size, random_seed),
+                n_boot,
+                n_workers,
+                track_memory
+            )
+    if st.session_state.generation_job is not None:
+        job_progress('generation_job', "✖️ Cancel Generation")
+    
+    notice = st.session_state.generation_job_notice
+    st.session_state.generation_job_notice = None
+    if notice is not None:
+        if notice['status'] == 'done':
+            st.session_state.dataset, st.session_state.statistics = notice['result']
+            st.success(f"✅ Dataset generated successfully in {notice['seconds']:.1f}s!")
+        elif notice['status'] == 'cancelled':
+            st.info("Generation cancelled.")
+        else:
+            st.error(f"Generation failed: {notice['error']}")
+    
+    # Streaming export for datasets beyond the in-memory sample size cap
+    with st.expander("📦 Large Dataset Export (streamed to disk)"):
+        st.caption("Generates the dataset in chunks and writes each chunk straight to a file in the server's "
+                   "output directory, so memory use depends on the chunk size, not the number of respondents.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            stream_size = st.number_input("Respondents", min_value=50, max_value=50_000_000, value=1_000_000, step=10_000)
+        with col2:
+            stream_chunk = st.number_input("Chunk Size", min_value=BLOCK_SIZE, max_value=1_000_000, value=DEFAULT_CHUNK_SIZE, step=BLOCK_SIZE)
+        with col3:
+            stream_format = st.selectbox("Format", STREAM_FORMATS)
+        stream_name = st.text_input("Output File", value=f"survey_data_n{stream_size}.{stream_format}",
+                                    help="File name inside the server's output directory")
+        
+        if st.session_state.export_job is None:
+            if st.button("💾 Write Dataset", use_container_width=True):
+                try:
+                    stream_path = output_path(stream_name)
+                except (ValueError, OSError) as exc:
+                    st.error(f"Export failed: {exc}")
+                else:
+                    st.session_state.export_job_notice = None
+                    st.session_state.export_job = get_job_runner().submit(
+                        export_job,
+                        get_output_directory(),
+                        stream_path,
+                        session_config(stream_size, random_seed),
+                        stream_format,
+                        stream_chunk,
+                        n_workers
+                    )
+        if st.session_state.export_job is not None:
+            job_progress('export_job', "✖️ Cancel Export")
+        
+        notice = st.session_state.export_job_notice
+        if notice is not None:
+            if notice['status'] == 'done':
+                written_path, rows, written_statistics = notice['result']
+                st.success(f"✅ Wrote {rows:,} responses to {written_path.name} in {notice['seconds']:.1f}s")
+                output_download(
+                    written_path,
+                    label=f"📥 Download {written_path.name}",
+                    data=written_path.read_bytes,
+                    file_name=written_path.name,
+                    mime=EXPORT_MIME_TYPES[written_path.suffix.lstrip('.')]
+                )
+                st.dataframe(written_statistics, use_container_width=True)
+            elif notice['status'] == 'cancelled':
+                st.info("Export cancelled; the partial file was removed.")
+            else:
+                st.error(f"Export failed: {notice['error']}")
+    
+    # Monte Carlo check of the "significant" flags set in the Relationships tab
+    with st.expander("🎲 Power Simulation"):
+        st.caption("Generates many replicate datasets of the current model at the chosen sample size, "
+                   "estimates every path in each and reports how often it is significant (power) "
+                   "and how far the average estimate is from the target coefficient (bias).")
+        col1, col2 = st.columns(2)
+        with col1:
+            n_replicates = st.number_input("Replicates", min_value=10, max_value=10_000, value=1000, step=100)
+        with col2:
+            power_alpha = st.selectbox("Significance Level", [0.05, 0.01, 0.10])
+        
+        if st.session_state.power_job is None:
+            if st.button("▶️ Run Simulation", use_container_width=True, disabled=not st.session_state.relationships):
+                st.session_state.power_job_notice = None
+                st.session_state.power_job = get_job_runner().submit(
+                    power_job,
+                    session_config(sample_size, random_seed),
+                    n_replicates,
+                    power_alpha,
+                    n_workers
+                )
+        if st.session_state.power_job is not None:
+            job_progress('power_job', "✖️ Cancel Simulation")
+        
+        notice = st.session_state.power_job_notice
+        if notice is not None:
+            if notice['status'] == 'done':
+                power, power_size = notice['result']
+                st.dataframe(power, use_container_width=True)
+                mismatched = power[(power['Power'] >= 0.8) != (power['Marked Significant'] == 'Yes')]
+                for path in mismatched['Path']:
+                    st.warning(f"⚠️ {path}: the significance flag does not match the simulated power "
+                               f"(80% threshold) at n = {power_size}.")
+            elif notice['status'] == 'cancelled':
+                st.info("Simulation cancelled.")
+            else:
+                st.error(f"Simulation failed: {notice['error']}")
+    
+    # Grid of model variants written as one partitioned dataset (one folder per combination)
+    with st.expander("🧪 Parameter Sweep"):
+        st.caption("Generates the current model once per combination of the values below and writes each "
+                   "dataset to its own partition, e.g. coefficient=0.3/sample_size=500/seed=1/part-0.parquet. "
+                   "Leave a field empty to keep the model's value.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sweep_sizes = st.text_input("Sample Sizes", value=f"{sample_size}", help="Comma-separated, e.g. 200, 500, 1000")
+        with col2:
+            sweep_seeds = st.text_input("Seeds", value=f"{random_seed}", help="Comma-separated, e.g. 1, 2, 3")
+        with col3:
+            sweep_coefficients = st.text_input("Path Coefficients", value="",
+                                               help="Applied to every path, e.g. 0.1, 0.3, 0.5")
+        col1, col2 = st.columns(2)
+        with col1:
+            sweep_format = st.selectbox("Format", SWEEP_FORMATS, key="sweep_format")
+        with col2:
+            sweep_name = st.text_input("Output Directory", value="sweep",
+                                       help="Folder name inside the server's output directory")
+        
+        if st.session_state.sweep_job is None:
+            if st.button("🧪 Run Sweep", use_container_width=True):
+                try:
+                    grid = {
+                        key: [parse(value) for value in text.split(',') if value.strip()]
+                        for key, text, parse in (('coefficient', sweep_coefficients, float),
+                                                 ('sample_size', sweep_sizes, int),
+                                                 ('seed', sweep_seeds, int))
+                    }
+                    grid = {key: values for key, values in grid.items() if values}
+                    sweep_dir = output_path(sweep_name)
+                except (ValueError, OSError) as exc:
+                    st.error(f"Sweep failed: {exc}")
+                else:
+                    st.session_state.sweep_job_notice = None
+                    st.session_state.sweep_job = get_job_runner().submit(
+                        sweep_job,
+                        get_output_directory(),
+                        session_config(sample_size, random_seed),
+                        grid,
+                        sweep_dir,
+                        sweep_format,
+                        n_workers
+                    )
+        if st.session_state.sweep_job is not None:
+            job_progress('sweep_job', "✖️ Cancel Sweep")
+        
+        notice = st.session_state.sweep_job_notice
+        if notice is not None:
+            if notice['status'] == 'done':
+                sweep_dir, cells = notice['result']
+                st.success(f"✅ Wrote {len(cells):,} partitions ({cells['rows'].sum():,} responses) "
+                           f"to {sweep_dir.name}")
+                output_download(
+                    sweep_dir,
+                    label=f"📥 Download {sweep_dir.name}.zip",
+                    data=partial(directory_zip_bytes, sweep_dir),
+                    file_name=f"{sweep_dir.name}.zip",
+                    mime=EXPORT_MIME_TYPES['zip']
+                )
+                st.dataframe(cells, use_container_width=True)
+            elif notice['status'] == 'cancelled':
+                st.info("Sweep cancelled; the partitions written so far were kept.")
+            else:
+                st.error(f"Sweep failed: {notice['error']}")
+    
+    results_panel(sample_size, random_seed)
+
 # ============================================================
 # TAB 5: VISUALIZATION & EXPLORATION DASHBOARD
 # ============================================================
-with tab5:
+# Derived data is cached per dataset version; the frame itself is not hashed
+@st.cache_data(max_entries=32)
+def descriptive_summary(dataset_key, _df):
+    return column_statistics(_df)
+
+
+@st.fragment
+def visualization_dashboard():
     st.header("📈 Data Visualization and Exploration")
 
-    if st.session_state.generated_data is not None:
-        df = st.session_state.generated_data
+    if st.session_state.dataset is not None:
+        df = current_dataset()
         st.success("✅ Data loaded for visualization")
 
         numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
@@ -395,22 +996,22 @@ with tab5:
             # VARIABLE SUMMARY
             # -------------------------------
             st.subheader("🔍 Descriptive Summary")
-            summary_df = pd.DataFrame({
-                "Mean": df[numeric_cols].mean().round(3),
-                "SD": df[numeric_cols].std().round(3),
-                "Skewness": df[numeric_cols].skew().round(3),
-                "Kurtosis": df[numeric_cols].kurtosis().round(3)
-            })
+            summary_df = descriptive_summary(st.session_state.dataset.key, df)
             st.dataframe(summary_df, use_container_width=True)
 
             st.markdown("---")
             st.subheader("🎨 Chart Options")
 
+            # Charts work on whole constructs (mean score) or single items;
+            # the ID column is not a measure
+            variables = st.session_state.statistics['variables']
+            plot_cols = [v['name'] for v in variables] + item_columns(variables)
+
             col1, col2 = st.columns(2)
             with col1:
-                x_col = st.selectbox("Select Variable (X)", numeric_cols)
+                x_col = st.selectbox("Select Variable (X)", plot_cols)
             with col2:
-                y_col = st.selectbox("Select Variable (Y)", ["None"] + numeric_cols)
+                y_col = st.selectbox("Select Variable (Y)", ["None"] + plot_cols)
 
             chart_type = st.radio(
                 "Choose Chart Type",
@@ -418,46 +1019,24 @@ with tab5:
                 horizontal=True
             )
 
-            import plotly.express as px
-            import plotly.figure_factory as ff
-
             # -------------------------------
             # VISUALIZATION LOGIC
             # -------------------------------
+            # Figures are reduced server-side and cached per dataset version
+            figure = partial(dashboard_figure, df, variables, version=st.session_state.dataset.key)
             fig = None
             if chart_type == "Histogram":
-                fig = px.histogram(df, x=x_col, nbins=20, title=f"Distribution of {x_col}")
+                fig = figure('histogram', x_col)
             elif chart_type == "Box Plot":
-                fig = px.box(df, y=x_col, title=f"Box Plot of {x_col}")
+                fig = figure('box', x_col)
             elif chart_type == "Scatter Plot" and y_col != "None":
-                fig = px.scatter(df, x=x_col, y=y_col, title=f"{x_col} vs {y_col}")
+                fig = figure('scatter', x_col, y_col)
             elif chart_type == "Correlation Heatmap":
-                corr = df[numeric_cols].corr().round(2)
-                z = corr.values
-                x = corr.columns.tolist()
-                y = corr.columns.tolist()
-                fig = ff.create_annotated_heatmap(
-                    z=z, x=x, y=y, colorscale="Blues", showscale=True
-                )
-                fig.update_layout(
-                    title="Correlation Heatmap",
-                    xaxis=dict(tickangle=45),
-                    width=800,
-                    height=700,
-                )
+                drill_down = st.multiselect("Item-level drill-down", [v['name'] for v in variables],
+                                            help="Show the item correlations of the selected constructs.")
+                fig = figure('heatmap', tuple(drill_down))
 
-            # -------------------------------
-            # FIGURE STYLING
-            # -------------------------------
             if fig:
-                fig.update_layout(
-                    title_x=0.5,
-                    title_font=dict(size=20),
-                    font=dict(family="Times New Roman", size=14),
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    margin=dict(l=40, r=40, t=80, b=40)
-                )
                 st.plotly_chart(fig, use_container_width=True)
                 st.markdown(
                     "_All figures generated in publication-ready format (600 dpi equivalent, Times New Roman)._"
@@ -466,6 +1045,10 @@ with tab5:
         st.info("Generate a dataset first to view visualizations.")
 
 
+with tab5:
+    visualization_dashboard()
+
+
 # Footer and Disclaimer
 footer_brand()
 disclaimer_note()
@@ -0,0 +1,70 @@
+import argparse
+import sys
+
+from benchmarks.cases import CASES
+from benchmarks.runner import (DEFAULT_CONSTRUCTS, DEFAULT_HISTORY, DEFAULT_ITEMS, DEFAULT_SIZES,
+                               REGRESSION_THRESHOLD, compare_runs, find_run, format_report, load_history,
+                               record_run, run_suite)
+
+# ===============================================================
+# 🖥️ Benchmark Command Line
+# ---------------------------------------------------------------
+#   python -m benchmarks --sizes 1000 100000 --label before
+#   python -m benchmarks --sizes 1000 100000 --baseline before
+#   python -m benchmarks --report-only
+# ===============================================================
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description="Time generation, statistics, export and visualization and compare with earlier runs."
+    )
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES, help="sample sizes")
+    parser.add_argument('--constructs', nargs='+', type=int, default=DEFAULT_CONSTRUCTS, help="construct counts")
+    parser.add_argument('--items', nargs='+', type=int, default=DEFAULT_ITEMS, help="items per construct")
+    parser.add_argument('--repeat', type=int, default=3, help="timed repeats per case (best is kept)")
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument('--label', help="name for this run, usable as --baseline later")
+    parser.add_argument('--baseline', help="run id or label to compare with (default: the previous run)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="relative slowdown / memory growth reported as a regression")
+    parser.add_argument('--report-only', action='store_true', help="compare the latest recorded run, run nothing")
+    parser.add_argument('--fail-on-regression', action='store_true', help="exit with status 1 on regressions")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.report_only:
+        history = load_history(args.history)
+        if not history['runs']:
+            print("error: the benchmark history is empty", file=sys.stderr)
+            return 2
+        current = history['runs'][-1]
+    else:
+        results = run_suite(args.cases, args.sizes, args.constructs, args.items, repeat=args.repeat)
+        current = record_run(results, args.history, label=args.label)
+        history = load_history(args.history)
+        print(f"Recorded run {current['id']} in {args.history}")
+
+    try:
+        baseline = find_run(history, args.baseline)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if baseline is None or baseline['id'] == current['id']:
+        print("No earlier run to compare with.")
+        return 0
+
+    rows = compare_runs(baseline, current, args.threshold)
+    print(format_report(baseline, current, rows, args.threshold))
+    if args.fail_on_regression and any(row['regression'] for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+from components.generator import (child_rng, generate_dataset, likertize_matrix, sample_latent,
+                                  sample_standardized_latent)
+
+# ===============================================================
+# 🏁 Benchmark Cases
+# ---------------------------------------------------------------
+# Every case has a setup step (not timed) that builds its inputs
+# for one model size, and a run step that is timed. Model sizes
+# are a synthetic chain of constructs C1 → C2 → … with a fixed
+# number of items each.
+# ===============================================================
+
+# Largest sample the Excel case runs at (openpyxl writes cell by cell)
+EXCEL_MAX_ROWS = 10_000
+
+
+def benchmark_model(n_constructs, n_items):
+    """Variables and chain relationships of a synthetic benchmark model."""
+    variables = [
+        {'name': f'C{i + 1}', 'items': n_items, 'mean': 3.2, 'sd': 0.6, 'role': 'IV'}
+        for i in range(n_constructs)
+    ]
+    relationships = [
+        {'from': f'C{i + 1}', 'to': f'C{i + 2}', 'coefficient': 0.3, 'significant': True}
+        for i in range(n_constructs - 1)
+    ]
+    return variables, relationships
+
+
+def _model(sample_size, n_constructs, n_items):
+    variables, relationships = benchmark_model(n_constructs, n_items)
+    return {'variables': variables, 'relationships': relationships, 'sample_size': sample_size}
+
+
+def _dataset(sample_size, n_constructs, n_items):
+    state = _model(sample_size, n_constructs, n_items)
+    state['df'] = generate_dataset(state['variables'], state['relationships'], sample_size, seed=1)
+    return state
+
+
+def _latent(sample_size, n_constructs, n_items):
+    state = _model(sample_size, n_constructs, n_items)
+    state['latent'] = sample_latent(state['variables'], state['relationships'], sample_size, child_rng(1))
+    return state
+
+
+def run_latent_sampling(state):
+    sample_standardized_latent(state['variables'], state['relationships'], state['sample_size'],
+                               child_rng(2))
+
+
+def run_likert_conversion(state):
+    items_per_var = [v['items'] for v in state['variables']]
+    likertize_matrix(state['latent'], items_per_var, child_rng(3))
+
+
+def run_descriptives(state):
+    from components.psychometrics import column_statistics
+
+    column_statistics(state['df'])
+
+
+def run_psychometrics(state):
+    from components.psychometrics import construct_statistics
+
+    construct_statistics(state['df'], state['variables'])
+
+
+def _export(fmt):
+    def run(state):
+        from components.export import export_bytes
+
+        export_bytes(state['df'], fmt)
+    return run
+
+
+def run_heatmap(state):
+    from components.viz import heatmap_figure
+
+    heatmap_figure(state['df'], state['variables']).to_json()
+
+
+# name → (setup, run, largest sample size or None)
+CASES = {
+    'latent_sampling': (_model, run_latent_sampling, None),
+    'likert_conversion': (_latent, run_likert_conversion, None),
+    'descriptives': (_dataset, run_descriptives, None),
+    'psychometrics': (_dataset, run_psychometrics, None),
+    'export_csv': (_dataset, _export('csv'), None),
+    'export_excel': (_dataset, _export('xlsx'), EXCEL_MAX_ROWS),
+    'export_parquet': (_dataset, _export('parquet'), None),
+    'export_feather': (_dataset, _export('feather'), None),
+    'heatmap': (_dataset, run_heatmap, None),
+}
+
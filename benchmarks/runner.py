@@ -0,0 +1,176 @@
+import gc
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.cases import CASES
+
+# ===============================================================
+# ⏱️ Benchmark Runner, History and Regression Report
+# ---------------------------------------------------------------
+# Times every case over a grid of model sizes (best of N repeats)
+# and measures its peak traced memory in a separate run, so the
+# tracing overhead never leaks into the timings. Runs are appended
+# to a JSON history; the report compares the latest run with a
+# baseline run and flags cases that got slower or bigger.
+# ===============================================================
+
+DEFAULT_HISTORY = Path(__file__).with_name('history.json')
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_CONSTRUCTS = (5, 20)
+DEFAULT_ITEMS = (4,)
+REGRESSION_THRESHOLD = 0.10
+
+# Differences below these are timer / allocator noise, never regressions
+MIN_SECONDS = 0.005
+MIN_PEAK_MB = 1.0
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(run, state, repeat=3):
+    """Best wall time of ``repeat`` runs and peak traced memory (MB) of one more."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(state)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 1024 ** 2
+
+
+def run_suite(cases=None, sizes=DEFAULT_SIZES, constructs=DEFAULT_CONSTRUCTS, items=DEFAULT_ITEMS,
+              repeat=3, log=print):
+    """Run ``cases`` (default: all) over the size grid; returns result records.
+
+    Cases whose optional dependency is missing are skipped with a note.
+    Setup results are shared by the cases that need the same inputs.
+    """
+    results = []
+    for sample_size in sizes:
+        for n_constructs in constructs:
+            for n_items in items:
+                setups = {}
+                for name in cases or CASES:
+                    setup, run, max_size = CASES[name]
+                    if max_size is not None and sample_size > max_size:
+                        continue
+                    if setup not in setups:
+                        setups.clear()
+                        setups[setup] = setup(sample_size, n_constructs, n_items)
+                    try:
+                        seconds, peak_mb = measure(run, setups[setup], repeat)
+                    except ImportError as exc:
+                        log(f"skip {name}: {exc}")
+                        continue
+                    record = {
+                        'case': name,
+                        'sample_size': sample_size,
+                        'constructs': n_constructs,
+                        'items': n_items,
+                        'seconds': round(seconds, 6),
+                        'peak_mb': round(peak_mb, 3),
+                    }
+                    results.append(record)
+                    log(f"{name:<18} n={sample_size:<9,} C={n_constructs:<3} k={n_items:<3} "
+                        f"{seconds:9.4f}s {peak_mb:10.1f} MB")
+    return results
+
+
+def load_history(path=DEFAULT_HISTORY):
+    path = Path(path)
+    if not path.exists():
+        return {'runs': []}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def record_run(results, path=DEFAULT_HISTORY, label=None):
+    """Append a run (results plus environment) to the JSON history; returns it."""
+    history = load_history(path)
+    run = {
+        'id': len(history['runs']) + 1,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'label': label,
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+        'results': results,
+    }
+    history['runs'].append(run)
+    Path(path).write_text(json.dumps(history, indent=2), encoding='utf-8')
+    return run
+
+
+def find_run(history, ref):
+    """A run by id or label; ``None`` picks the one before the latest."""
+    runs = history['runs']
+    if ref is None:
+        return runs[-2] if len(runs) > 1 else None
+    for run in reversed(runs):
+        if str(run['id']) == str(ref) or run.get('label') == ref:
+            return run
+    raise ValueError(f"No benchmark run with id or label '{ref}'")
+
+
+def _key(record):
+    return record['case'], record['sample_size'], record['constructs'], record['items']
+
+
+def compare_runs(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """Per-case ratios of ``current`` to ``baseline`` for the grid points both ran.
+
+    A case regresses when its time or peak memory grew by more than
+    ``threshold`` (a fraction) and by more than the noise floor.
+    """
+    before = {_key(r): r for r in baseline['results']}
+    rows = []
+    for record in current['results']:
+        old = before.get(_key(record))
+        if old is None:
+            continue
+        time_ratio = record['seconds'] / old['seconds'] if old['seconds'] else np.inf
+        memory_ratio = record['peak_mb'] / old['peak_mb'] if old['peak_mb'] else np.inf
+        slower = time_ratio > 1 + threshold and record['seconds'] - old['seconds'] > MIN_SECONDS
+        bigger = memory_ratio > 1 + threshold and record['peak_mb'] - old['peak_mb'] > MIN_PEAK_MB
+        rows.append({**record, 'time_ratio': time_ratio, 'memory_ratio': memory_ratio,
+                     'regression': slower or bigger})
+    return rows
+
+
+def format_report(baseline, current, rows, threshold=REGRESSION_THRESHOLD):
+    lines = [
+        f"Run {current['id']} ({current.get('label') or current['commit']}) vs "
+        f"run {baseline['id']} ({baseline.get('label') or baseline['commit']}), threshold {threshold:.0%}",
+        f"{'case':<18} {'n':>9} {'C':>3} {'k':>3} {'time':>10} {'Δtime':>8} {'peak MB':>9} {'Δmem':>8}",
+    ]
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        lines.append(
+            f"{row['case']:<18} {row['sample_size']:>9,} {row['constructs']:>3} {row['items']:>3} "
+            f"{row['seconds']:>9.4f}s {row['time_ratio'] - 1:>+8.1%} {row['peak_mb']:>9.1f} "
+            f"{row['memory_ratio'] - 1:>+8.1%}{flag}"
+        )
+    regressions = sum(row['regression'] for row in rows)
+    lines.append(f"{regressions} regression(s) in {len(rows)} compared case(s)")
+    return '\n'.join(lines)
@@ -1 +1,41 @@
+# ===============================================================
+# 📦 Package-Level API
+# ---------------------------------------------------------------
+# Names resolve lazily on first access, so ``import components``
+# stays cheap and never pulls in Streamlit, plotting or Excel
+# libraries.
+# ===============================================================
 
+_EXPORTS = {
+    'load_config': 'components.api',
+    'normalize_config': 'components.api',
+    'generate': 'components.api',
+    'generate_to_file': 'components.api',
+    'generate_dataset': 'components.generator',
+    'iter_dataset_chunks': 'components.generator',
+    'write_dataset': 'components.streaming',
+    'export_bytes': 'components.export',
+    'construct_statistics': 'components.psychometrics',
+    'construct_scores': 'components.paths',
+    'estimate_paths': 'components.paths',
+    'simulate_power': 'components.power',
+    'Profiler': 'components.profiling',
+    'run_sweep': 'components.sweep',
+    'DatasetStore': 'components.store',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'components' has no attribute '{name}'")
+    import importlib
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
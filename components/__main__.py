@@ -0,0 +1,110 @@
+import argparse
+import logging
+import os
+import sys
+import time
+
+from components.api import generate_to_file, load_config, read_mapping
+from components.cache import config_hash
+from components.parallel import available_workers
+from components.profiling import Profiler, log_profile, logger as profile_logger
+from components.psychometrics import construct_accumulator, statistics_from_accumulator
+from components.sweep import SWEEP_FORMATS, run_sweep
+
+# ===============================================================
+# 🖥️ Command-Line Entry Point
+# ---------------------------------------------------------------
+#   python -m components model.json -o survey.parquet --sample-size 1000000
+#   python -m components model.json --grid grid.json -o sweep/
+# ===============================================================
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m components',
+        description="Generate a synthetic survey dataset from a JSON/YAML model config."
+    )
+    parser.add_argument('config', help="model config (.json, .yaml or .yml)")
+    parser.add_argument('-o', '--output', required=True,
+                        help="output file (.csv, .parquet, .feather or .npy); with --grid, the output directory")
+    parser.add_argument('-f', '--format', choices=('csv', 'parquet', 'feather', 'npy'),
+                        help="output format (default: from the output suffix)")
+    parser.add_argument('-n', '--sample-size', type=int, help="number of respondents (overrides the config)")
+    parser.add_argument('-s', '--seed', type=int, help="random seed (overrides the config)")
+    parser.add_argument('--model', choices=('sem', 'correlation'), help="latent model (overrides the config)")
+    parser.add_argument('--calibrate', action='store_true', default=None,
+                        help="calibrate items to the target means/SDs")
+    parser.add_argument('--grid', help="sweep grid (.json/.yaml) mapping parameters to value lists; writes a "
+                                         "hive-partitioned dataset with one partition per combination")
+    parser.add_argument('--chunk-size', type=int, help="rows generated and written per chunk")
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help=f"worker processes (1-{available_workers()})")
+    parser.add_argument('--stats', action='store_true',
+                        help="print construct statistics of the written data (collected in the same pass)")
+    parser.add_argument('--profile', action='store_true',
+                        help="log per-stage timings as one JSON line on stderr")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="add per-stage peak memory to the profile (tracemalloc, slower)")
+    parser.add_argument('-q', '--quiet', action='store_true', help="do not print a summary")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    overrides = {'sample_size': args.sample_size, 'seed': args.seed, 'model': args.model, 'calibrate': args.calibrate}
+    config.update({key: value for key, value in overrides.items() if value is not None})
+
+    if args.grid:
+        return run_grid(args, config)
+
+    accumulator = construct_accumulator(config['variables']) if args.stats else None
+    profiler = Profiler(trace_memory=args.trace_memory)
+    started = time.perf_counter()
+    try:
+        with profiler:
+            rows = generate_to_file(config, args.output, fmt=args.format, chunk_size=args.chunk_size,
+                                    n_workers=args.workers, accumulator=accumulator)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    if args.profile or args.trace_memory:
+        profiler.note(config_hash=config_hash(config), output=str(args.output), rows=rows,
+                      file_mb=round(os.path.getsize(args.output) / 1024 ** 2, 3), n_workers=args.workers)
+        profile_logger.addHandler(logging.StreamHandler(sys.stderr))
+        profile_logger.setLevel(logging.INFO)
+        log_profile(profiler.report(), event='generate_to_file')
+
+    if not args.quiet:
+        print(f"Wrote {rows:,} responses to {args.output} in {time.perf_counter() - started:.2f}s")
+    if accumulator is not None:
+        print(statistics_from_accumulator(accumulator, config['variables']).to_string(index=False))
+    return 0
+
+
+def run_grid(args, config):
+    fmt = args.format or 'parquet'
+    if fmt not in SWEEP_FORMATS:
+        print(f"error: sweeps write one of {', '.join(SWEEP_FORMATS)}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    try:
+        grid = read_mapping(args.grid)
+        cells = run_sweep(config, grid, args.output, fmt=fmt, n_workers=args.workers, chunk_size=args.chunk_size)
+    except (OSError, ValueError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(f"Wrote {len(cells):,} partitions ({cells['rows'].sum():,} responses) to {args.output} "
+              f"in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
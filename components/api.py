@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+
+# ===============================================================
+# 🧰 Headless Library API
+# ---------------------------------------------------------------
+# Generate datasets from a model config file without Streamlit.
+# The config has the same shape as the app's session state:
+# ``variables``, ``relationships``, ``moderators`` and ``mediators``
+# plus optional ``sample_size``, ``seed``, ``model``, ``calibrate``
+# and ``responses`` (missingness and careless responders, see
+# ``components.responses``). Heavy libraries (pyarrow, openpyxl, plotly) are
+# only imported by the code paths that need them.
+# ===============================================================
+
+DEFAULT_SAMPLE_SIZE = 926
+DEFAULT_SEED = 2025
+
+REQUIRED_KEYS = {
+    'variables': ('name', 'items', 'mean', 'sd'),
+    'relationships': ('from', 'to', 'coefficient'),
+    'moderators': ('moderator', 'iv', 'dv', 'effect'),
+    'mediators': ('mediator', 'iv', 'dv', 'indirect'),
+}
+
+
+def read_mapping(path):
+    """Parse a ``.json`` or ``.yaml``/``.yml`` file."""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise ImportError("YAML configs require 'pyyaml' (pip install pyyaml)") from exc
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def load_config(path):
+    """Read a model config from a ``.json`` or ``.yaml``/``.yml`` file."""
+    return normalize_config(read_mapping(path))
+
+
+def normalize_config(config):
+    """Validate a config dict and fill in defaults; raises ``ValueError`` when malformed."""
+    if not isinstance(config, dict):
+        raise ValueError("Model config must be a mapping")
+    if not config.get('variables'):
+        raise ValueError("Model config needs at least one entry in 'variables'")
+
+    normalized = {key: [dict(entry) for entry in config.get(key) or []] for key in REQUIRED_KEYS}
+    for section, keys in REQUIRED_KEYS.items():
+        for position, entry in enumerate(normalized[section]):
+            missing = [key for key in keys if key not in entry]
+            if missing:
+                raise ValueError(f"{section}[{position}] is missing {', '.join(missing)}")
+
+    for var in normalized['variables']:
+        var.setdefault('role', 'IV')
+    for rel in normalized['relationships']:
+        rel.setdefault('significant', True)
+
+    normalized['sample_size'] = int(config.get('sample_size', DEFAULT_SAMPLE_SIZE))
+    normalized['seed'] = int(config.get('seed', DEFAULT_SEED))
+    normalized['model'] = config.get('model', 'sem')
+    normalized['calibrate'] = bool(config.get('calibrate', False))
+
+    from components.generator import reverse_columns
+    from components.responses import normalize_responses
+
+    reverse_columns(normalized['variables'])
+    responses = config.get('responses')
+    normalized['responses'] = normalize_responses(responses, normalized['variables']) if responses else None
+    return normalized
+
+
+def _model_kwargs(config):
+    return {
+        'moderators': config['moderators'],
+        'mediators': config['mediators'],
+        'model': config['model'],
+        'calibrate': config['calibrate'],
+        'responses': config['responses'],
+    }
+
+
+def generate(config, n_workers=1):
+    """Generate the dataset described by ``config`` in memory (DataFrame)."""
+    from components.generator import generate_dataset
+
+    config = normalize_config(config)
+    return generate_dataset(
+        config['variables'], config['relationships'], config['sample_size'], config['seed'],
+        n_workers=n_workers, **_model_kwargs(config)
+    )
+
+
+def generate_to_file(config, path, fmt=None, chunk_size=None, n_workers=1, progress=None, accumulator=None,
+                     id_rows=None):
+    """Stream the dataset described by ``config`` to ``path``; returns rows written.
+
+    The format comes from ``fmt`` or the file suffix (csv, parquet, feather, npy).
+    An optional ``accumulator`` collects item moments while writing, and
+    ``id_rows`` sizes the ID dtype (see ``iter_dataset_chunks``).
+    """
+    from components.streaming import DEFAULT_CHUNK_SIZE, write_dataset
+
+    config = normalize_config(config)
+    return write_dataset(
+        path, config['variables'], config['relationships'], config['sample_size'], config['seed'],
+        fmt=fmt, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE, n_workers=n_workers, progress=progress,
+        accumulator=accumulator, id_rows=id_rows, **_model_kwargs(config)
+    )
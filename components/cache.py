@@ -0,0 +1,148 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# ===============================================================
+# 🗂️ Config-Hash Memoization with LRU Eviction
+# ---------------------------------------------------------------
+# Generated datasets are keyed on a canonical hash of the model
+# configuration, so identical requests (same variables, paths,
+# moderators, mediators, N and seed) become cache hits.
+# ===============================================================
+
+
+def _canonical(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not hashable as config")
+
+
+def config_hash(config):
+    """SHA-256 of the canonical (sorted-key, compact) JSON form of ``config``."""
+    payload = json.dumps(config, sort_keys=True, separators=(',', ':'), default=_canonical)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def dataset_config(variables, relationships, moderators, mediators, sample_size, seed, **options):
+    """Everything that determines a generated dataset, as one hashable dict."""
+    return {
+        'variables': variables,
+        'relationships': relationships,
+        'moderators': moderators,
+        'mediators': mediators,
+        'sample_size': int(sample_size),
+        'seed': int(seed),
+        'options': options,
+    }
+
+
+def sizeof(value):
+    """Approximate in-memory size of a cached value in bytes."""
+    if hasattr(value, 'memory_usage'):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    return 0
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by entry count and total size.
+
+    Values are shared between callers (and Streamlit sessions), so they
+    must be treated as read-only. ``sizer`` estimates a value's size in
+    bytes (``sizeof`` by default).
+    """
+
+    def __init__(self, max_entries=32, max_bytes=512 * 1024 ** 2, sizer=sizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizer = sizer
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        size = self.sizer(value)
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            value = self._entries.get(key, default)
+            self._discard(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss.
+
+        Concurrent callers asking for the same missing key wait for the
+        first computation instead of repeating it.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                with self._lock:
+                    value = self._entries.get(key, missing)
+                    if value is not missing:
+                        self.hits += 1
+                        self._entries.move_to_end(key)
+                        return value
+                return self.put(key, compute())
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+
+    def _discard(self, key):
+        if key in self._entries:
+            del self._entries[key]
+            self._total_bytes -= self._sizes.pop(key)
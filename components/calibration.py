@@ -0,0 +1,121 @@
+import numpy as np
+
+from components.cache import LRUCache, config_hash
+
+# ===============================================================
+# 🎯 Target Calibration for Likert Output
+# ---------------------------------------------------------------
+# Solves per-construct threshold cut points so the item values hit
+# the requested mean and SD. Items are discretized from standard-
+# normal item scores, so a threshold set fixes each level's
+# probability exactly; the solver finds the discretized normal
+# N(m, s) on the 1..5 grid whose moments equal the targets, for all
+# constructs at once with vectorized bisection steps.
+# ===============================================================
+
+CALIBRATION_TOLERANCE = 1e-4
+BISECTION_STEPS = 40
+SPREAD_RANGE = (0.01, 20.0)
+
+THRESHOLD_CACHE = LRUCache(max_entries=256, max_bytes=16 * 1024 ** 2)
+
+
+def _normal_cdf(x):
+    from scipy.special import ndtr
+
+    return ndtr(x)
+
+
+def _cut_points(center, spread, levels):
+    """Standard-normal cut points between consecutive levels (…, n_levels − 1)."""
+    boundaries = levels[:-1] + 0.5
+    return (boundaries - center[..., None]) / spread[..., None]
+
+
+def level_probabilities(cuts):
+    """Level probabilities implied by standard-normal cut points."""
+    cdf = _normal_cdf(cuts)
+    lower = np.concatenate([np.zeros(cdf.shape[:-1] + (1,)), cdf], axis=-1)
+    upper = np.concatenate([cdf, np.ones(cdf.shape[:-1] + (1,))], axis=-1)
+    return upper - lower
+
+
+def _moments(center, spread, levels):
+    probs = level_probabilities(_cut_points(center, spread, levels))
+    mean = probs @ levels
+    sd = np.sqrt(np.clip(probs @ levels ** 2 - mean ** 2, 0, None))
+    return mean, sd
+
+
+def _bisect(func, target, lower, upper, steps=BISECTION_STEPS):
+    """Vectorized bisection for increasing ``func``: per-element x with func(x) ≈ target."""
+    for _ in range(steps):
+        middle = (lower + upper) / 2
+        below = func(middle) < target
+        lower = np.where(below, middle, lower)
+        upper = np.where(below, upper, middle)
+    return (lower + upper) / 2
+
+
+def solve_thresholds(target_means, target_sds, levels=(1, 2, 3, 4, 5), tol=CALIBRATION_TOLERANCE):
+    """Cut points whose discretized item distribution has the target moments.
+
+    The item mean increases with the center ``m`` and, at a matched mean,
+    the SD increases with the spread ``s``; so ``s`` is bisected with an
+    inner bisection on ``m`` that keeps the mean on target, every step
+    evaluated for all constructs at once. Returns a dict with ``cuts``
+    (constructs × levels − 1), the ``achieved`` mean/SD, and ``converged``
+    (within ``tol`` of both targets). Unreachable targets, e.g. an SD below
+    what a discrete scale allows at that mean, end at the closest
+    attainable distribution.
+    """
+    levels = np.asarray(levels, dtype=float)
+    target_means = np.clip(np.asarray(target_means, dtype=float), levels[0], levels[-1])
+    target_sds = np.asarray(target_sds, dtype=float)
+
+    def center_for(spread):
+        margin = 10 * spread + 1
+        return _bisect(lambda m: _moments(m, spread, levels)[0], target_means,
+                       levels[0] - margin, levels[-1] + margin)
+
+    def sd_for(spread):
+        return _moments(center_for(spread), spread, levels)[1]
+
+    low, high = SPREAD_RANGE
+    spread = _bisect(sd_for, target_sds, np.full(len(target_sds), low), np.full(len(target_sds), high))
+    center = center_for(spread)
+
+    mean, sd = _moments(center, spread, levels)
+    converged = (np.abs(mean - target_means) < tol) & (np.abs(sd - target_sds) < tol)
+    return {
+        'cuts': _cut_points(center, spread, levels),
+        'achieved_mean': mean,
+        'achieved_sd': sd,
+        'converged': converged,
+    }
+
+
+def calibration_for(variables, cache=THRESHOLD_CACHE):
+    """Cached threshold solution for the constructs' target means and SDs."""
+    targets = [(float(v['mean']), float(v['sd'])) for v in variables]
+
+    def compute():
+        means, sds = zip(*targets) if targets else ((), ())
+        return solve_thresholds(means, sds)
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(config_hash({'targets': targets}), compute)
+
+
+def discretize(scores, cuts):
+    """Likert levels (uint8) of standard-normal ``scores`` given per-column ``cuts``.
+
+    ``scores`` is (n × columns) and ``cuts`` is (columns × levels − 1); each
+    level is one plus the number of cut points a score exceeds (the vectorized
+    form of ``np.searchsorted`` over every column at once).
+    """
+    levels = np.ones(scores.shape, dtype=np.uint8)
+    for k in range(cuts.shape[1]):
+        levels += scores > cuts[:, k]
+    return levels
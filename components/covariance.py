@@ -0,0 +1,107 @@
+import numpy as np
+
+from components.cache import LRUCache, config_hash
+
+# ===============================================================
+# 🧮 Latent Covariance Builder
+# ---------------------------------------------------------------
+# Builds the latent correlation matrix from the path settings,
+# repairs it when it is not positive definite (nearest correlation
+# matrix) and caches its Cholesky factor per configuration, so
+# repeated, chunked and parallel generation never refactorize.
+# ===============================================================
+
+# Share of a path coefficient carried into the latent correlation
+PATH_CORRELATION_SCALE = 0.6
+MIN_EIGENVALUE = 1e-8
+
+FACTOR_CACHE = LRUCache(max_entries=64, max_bytes=64 * 1024 ** 2)
+
+
+def name_index(variables):
+    """Map construct name → position in ``variables``."""
+    return {v['name']: i for i, v in enumerate(variables)}
+
+
+def build_correlation(variables, relationships):
+    """Latent correlation matrix implied by the path relationships.
+
+    Paths whose endpoints are not defined constructs are ignored.
+    """
+    index = name_index(variables)
+    corr = np.eye(len(index))
+
+    for rel in relationships:
+        from_idx, to_idx = index.get(rel['from']), index.get(rel['to'])
+        if from_idx is None or to_idx is None or from_idx == to_idx:
+            continue
+        corr[from_idx, to_idx] = corr[to_idx, from_idx] = rel['coefficient'] * PATH_CORRELATION_SCALE
+
+    return corr
+
+
+def is_positive_definite(matrix):
+    try:
+        np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        return False
+    return True
+
+
+def nearest_correlation(corr, tol=1e-10, max_iter=200, min_eigenvalue=MIN_EIGENVALUE):
+    """Nearest positive-definite correlation matrix (Higham, 2002).
+
+    Alternates projections onto the PSD cone and onto the unit-diagonal
+    matrices with Dykstra's correction, then lifts the spectrum to at least
+    ``min_eigenvalue`` so the result has a Cholesky factor.
+    """
+    y = np.array(corr, dtype=float)
+    correction = np.zeros_like(y)
+    for _ in range(max_iter):
+        r = y - correction
+        eigvals, eigvecs = np.linalg.eigh((r + r.T) / 2)
+        x = (eigvecs * np.clip(eigvals, min_eigenvalue, None)) @ eigvecs.T
+        correction = x - r
+        y_next = x.copy()
+        np.fill_diagonal(y_next, 1.0)
+        converged = np.linalg.norm(y_next - y, 'fro') <= tol * np.linalg.norm(y, 'fro')
+        y = y_next
+        if converged:
+            break
+
+    # Unit diagonal can leave tiny negative eigenvalues; lift and rescale
+    eigvals, eigvecs = np.linalg.eigh((y + y.T) / 2)
+    y = (eigvecs * np.clip(eigvals, min_eigenvalue, None)) @ eigvecs.T
+    scale = 1 / np.sqrt(np.diag(y))
+    return y * scale[:, None] * scale[None, :]
+
+
+def _factor_config(variables, relationships):
+    return {
+        'variables': [v['name'] for v in variables],
+        'relationships': [(r['from'], r['to'], float(r['coefficient'])) for r in relationships],
+    }
+
+
+def latent_factor(variables, relationships, cache=FACTOR_CACHE):
+    """Cholesky factor of the latent correlation matrix and whether it was repaired.
+
+    Returns ``{'chol', 'corr', 'repaired'}``; ``z @ chol.T`` turns standard-normal
+    ``z`` into standardized (unit-variance) latents with correlation ``corr``.
+    Results are cached on the parts of the config that define the
+    correlation (construct names and paths).
+    """
+    def compute():
+        corr = build_correlation(variables, relationships)
+        repaired = not is_positive_definite(corr)
+        if repaired:
+            corr = nearest_correlation(corr)
+        return {
+            'chol': np.linalg.cholesky(corr),
+            'corr': corr,
+            'repaired': repaired,
+        }
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(config_hash(_factor_config(variables, relationships)), compute)
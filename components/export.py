@@ -0,0 +1,148 @@
+import io
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from components.generator import ITEM_DTYPE, MISSING_ITEM_DTYPE
+from components.profiling import stage
+
+# ===============================================================
+# 📤 Dataset Export (on demand, cached per dataset version)
+# ---------------------------------------------------------------
+# Export payloads are serialized only when a download is requested
+# and memoized on (dataset version, format), so Streamlit reruns
+# never re-serialize an unchanged dataset.
+# ===============================================================
+
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'parquet': 'application/vnd.apache.parquet',
+    'feather': 'application/vnd.apache.arrow.file',
+    'npy': 'application/octet-stream',
+    'zip': 'application/zip',
+}
+
+# Item columns with missing responses are float; whole values print as 3, not 3.0
+CSV_FLOAT_FORMAT = '%g'
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ImportError("Parquet/Feather export requires 'pyarrow' (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def to_csv_bytes(df):
+    """UTF-8 CSV payload without the index."""
+    return df.to_csv(index=False, float_format=CSV_FLOAT_FORMAT).encode('utf-8')
+
+
+def to_excel_bytes(df, sheet_name='Sheet1'):
+    """XLSX payload written with openpyxl's streaming write-only workbook.
+
+    Rows are appended straight to the worksheet XML instead of building
+    the full cell object tree, so memory stays flat for large datasets.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(col) for col in df.columns])
+    # Missing responses (NaN) become empty cells
+    missing = df.select_dtypes(include='float').isna().to_numpy().any()
+    for row in df.itertuples(index=False, name=None):
+        sheet.append([None if value != value else value for value in row] if missing else row)
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def to_parquet_bytes(df, compression='zstd'):
+    """Parquet payload with dictionary + RLE encoding (ideal for 5-level items)."""
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, buffer, compression=compression, use_dictionary=True)
+    return buffer.getvalue()
+
+
+def to_feather_bytes(df, compression='uncompressed'):
+    """Feather v2 (Arrow IPC file) payload.
+
+    Uncompressed by default so consumers can memory-map it without a
+    decode step; pass ``compression='zstd'`` or ``'lz4'`` for a smaller file.
+    """
+    require_pyarrow()
+    import pyarrow.feather as feather
+
+    buffer = io.BytesIO()
+    feather.write_feather(df, buffer, compression=compression)
+    return buffer.getvalue()
+
+
+def item_matrix(df):
+    """The items as one C-contiguous matrix (the ID column is the row number + 1).
+
+    Ordinal (categorical) items are written as their Likert values, as
+    ``float32`` with NaN if any response is missing; object arrays could
+    not be loaded without pickle.
+    """
+    items = df.drop(columns='ID', errors='ignore')
+    categorical = [col for col, dtype in items.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if categorical:
+        dtype = MISSING_ITEM_DTYPE if items[categorical].isna().to_numpy().any() else ITEM_DTYPE
+        items = items.astype({col: dtype for col in categorical})
+    return np.ascontiguousarray(items.to_numpy())
+
+
+def to_npy_bytes(df):
+    """Raw ``.npy`` item matrix, loadable with ``np.load(..., mmap_mode='r')``."""
+    buffer = io.BytesIO()
+    np.save(buffer, item_matrix(df), allow_pickle=False)
+    return buffer.getvalue()
+
+
+def directory_zip_bytes(directory):
+    """ZIP payload of every file below ``directory``, with paths relative to it."""
+    directory = Path(directory)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(directory.rglob('*')):
+            if path.is_file():
+                archive.write(path, path.relative_to(directory).as_posix())
+    return buffer.getvalue()
+
+
+EXPORTERS = {
+    'csv': to_csv_bytes,
+    'xlsx': to_excel_bytes,
+    'parquet': to_parquet_bytes,
+    'feather': to_feather_bytes,
+    'npy': to_npy_bytes,
+}
+
+
+def export_bytes(df, fmt, version=None, cache=None):
+    """Serialize ``df`` to ``fmt``, reusing ``cache`` entries for the same ``version``.
+
+    ``version`` identifies the dataset contents (e.g. its config hash);
+    a new version never sees payloads of an older one.
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unsupported export format '{fmt}'; expected one of {tuple(EXPORTERS)}")
+    def serialize():
+        with stage(f'export {fmt}'):
+            return EXPORTERS[fmt](df)
+
+    if cache is None or version is None:
+        return serialize()
+    return cache.get_or_compute(f"{version}:{fmt}", serialize)
@@ -0,0 +1,295 @@
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from components.calibration import calibration_for, discretize
+from components.covariance import latent_factor
+from components.parallel import imap_ordered
+from components.profiling import stage
+from components.sem import compile_model, sample_structural
+
+# ===============================================================
+# ⚙️ Vectorized Survey Data Generation Engine
+# ---------------------------------------------------------------
+# Standalone (no Streamlit) generator that builds the whole
+# respondents × items matrix with batched NumPy operations.
+# ===============================================================
+
+LIKERT_MIN = 1
+LIKERT_MAX = 5
+LIKERT_LEVELS = list(range(LIKERT_MIN, LIKERT_MAX + 1))
+ITEM_NOISE = 0.45
+
+# Item values fit in one byte; stored datasets keep them that way
+ITEM_DTYPE = np.uint8
+# Missing responses are 0 in item matrices and NaN in dataset frames,
+# whose item columns then widen to this dtype
+MISSING_CODE = 0
+MISSING_ITEM_DTYPE = np.float32
+
+# 'sem' builds latents as structural equations (paths, mediators,
+# moderators); 'correlation' only turns paths into symmetric correlations
+LATENT_MODELS = ('sem', 'correlation')
+
+# Rows are generated in fixed blocks, each with its own random stream, so
+# the data never depends on how the rows are later chunked or written.
+BLOCK_SIZE = 10_000
+
+# PCG64 with the stronger DXSM output function: faster than the legacy
+# Mersenne Twister and robust across the many streams spawned per dataset
+BIT_GENERATOR = np.random.PCG64DXSM
+
+
+def item_columns(variables):
+    """Item column names in dataset order, e.g. PE1..PE4, ATT1..ATT4."""
+    return [f"{var['name']}{j + 1}" for var in variables for j in range(int(var['items']))]
+
+
+def reverse_columns(variables):
+    """Item column indices of reverse-keyed items (each variable's 1-based ``reverse`` item numbers)."""
+    columns = []
+    start = 0
+    for var in variables:
+        n_items = int(var['items'])
+        for number in var.get('reverse') or ():
+            if not 1 <= int(number) <= n_items:
+                raise ValueError(f"Reverse-keyed item {number} of {var['name']} is outside 1..{n_items}")
+            columns.append(start + int(number) - 1)
+        start += n_items
+    return sorted(set(columns))
+
+
+def sample_standardized_latent(variables, relationships, sample_size, rng,
+                               moderators=(), mediators=(), model='sem'):
+    """Draw standardized (mean 0, SD 1) latent scores, shape (sample_size × n_constructs).
+
+    With ``model='sem'`` the scores follow the compiled structural model.
+    With ``model='correlation'`` they come from the cached Cholesky factor of
+    the path-implied correlation matrix.
+    """
+    if model not in LATENT_MODELS:
+        raise ValueError(f"Unknown latent model '{model}'; expected one of {LATENT_MODELS}")
+
+    if model == 'sem':
+        structure = compile_model(variables, relationships, moderators, mediators)
+        eta = sample_structural(structure, sample_size, rng)
+        return eta / np.sqrt(np.diag(structure['sigma']))
+
+    chol = latent_factor(variables, relationships)['chol']
+    z = rng.standard_normal(size=(sample_size, len(variables)))
+    return z @ chol.T if chol.size else z
+
+
+def sample_latent(variables, relationships, sample_size, rng,
+                  moderators=(), mediators=(), model='sem'):
+    """Draw the (sample_size × n_constructs) latent score matrix on each
+    construct's mean/SD scale (see ``sample_standardized_latent``)."""
+    means = np.array([v['mean'] for v in variables], dtype=float)
+    sds = np.array([v['sd'] for v in variables], dtype=float)
+    eta = sample_standardized_latent(variables, relationships, sample_size, rng,
+                                     moderators=moderators, mediators=mediators, model=model)
+    return means + eta * sds
+
+
+def likertize_matrix(latent, items_per_var, rng, noise=ITEM_NOISE):
+    """Convert latent scores to Likert items in one batched draw.
+
+    Each construct column is repeated once per item and perturbed with a
+    single standard-normal draw over the whole matrix (``loc + scale * z``,
+    exactly what ``normal`` computes), then rounded (half to even, as
+    Python's ``round``) and clipped to the Likert range.
+    """
+    values = rng.standard_normal(size=(latent.shape[0], int(np.sum(items_per_var))))
+    values *= noise
+    values += np.repeat(latent, items_per_var, axis=1)
+    np.rint(values, out=values)
+    np.clip(values, LIKERT_MIN, LIKERT_MAX, out=values)
+    return values.astype(ITEM_DTYPE)
+
+
+def calibrated_likert_matrix(eta, variables, rng, noise=ITEM_NOISE):
+    """Convert standardized latents to Likert items that hit the target moments.
+
+    Item scores are standard normal, ``λ·η + √(1 − λ²)·ε``, with the
+    loading λ = sd / √(sd² + noise²) of the uncalibrated model, and are cut
+    at the solved per-construct thresholds (cached per target config).
+    """
+    items_per_var = [int(v['items']) for v in variables]
+    sds = np.array([v['sd'] for v in variables], dtype=float)
+    loading = sds / np.sqrt(sds ** 2 + noise ** 2)
+    cuts = calibration_for(variables)['cuts']
+
+    scores = rng.standard_normal(size=(eta.shape[0], int(np.sum(items_per_var))))
+    scores *= np.repeat(np.sqrt(1 - loading ** 2), items_per_var)
+    scores += np.repeat(eta * loading, items_per_var, axis=1)
+    return discretize(scores, np.repeat(cuts, items_per_var, axis=0))
+
+
+def child_rng(seed, *spawn_key):
+    """Independent ``Generator`` identified by ``spawn_key`` under ``seed``.
+
+    Every draw goes through an explicit generator like this one, never the
+    global NumPy state, so concurrent sessions and worker processes cannot
+    interleave each other's streams.
+    """
+    seed_seq = np.random.SeedSequence(seed, spawn_key=spawn_key)
+    return np.random.Generator(BIT_GENERATOR(seed_seq))
+
+
+def block_rng(seed, block):
+    """Random stream of one block: the ``block``-th child of ``SeedSequence(seed)``."""
+    return child_rng(seed, block)
+
+
+def generate_items(variables, relationships, n_rows, rng, noise=ITEM_NOISE, options=None):
+    """Generate an item matrix (n_rows × items) from ``rng``.
+
+    ``options`` holds ``calibrate`` plus the ``moderators``, ``mediators``
+    and latent ``model`` keyword arguments of ``sample_latent``.
+    """
+    options = dict(options or {})
+    calibrate = options.pop('calibrate', False)
+
+    if calibrate:
+        with stage('latent sampling'):
+            eta = sample_standardized_latent(variables, relationships, n_rows, rng, **options)
+        with stage('likert conversion'):
+            return calibrated_likert_matrix(eta, variables, rng, noise=noise)
+
+    items_per_var = [int(v['items']) for v in variables]
+    with stage('latent sampling'):
+        latent = sample_latent(variables, relationships, n_rows, rng, **options)
+    with stage('likert conversion'):
+        return likertize_matrix(latent, items_per_var, rng, noise=noise)
+
+
+def generate_block(variables, relationships, n_rows, seed, block, noise=ITEM_NOISE, options=None):
+    """Generate the item matrix (n_rows × items) of a single block (see ``generate_items``).
+
+    Reverse keying and the ``responses`` patterns of ``options`` are applied
+    to the block afterwards, from the same random stream.
+    """
+    from components.responses import apply_responses, responses_active
+
+    options = dict(options or {})
+    responses = options.pop('responses', None)
+    rng = block_rng(seed, block)
+    items = generate_items(variables, relationships, n_rows, rng, noise, options)
+    if responses_active(variables, responses):
+        with stage('response patterns'):
+            apply_responses(items, variables, responses, rng)
+    return items
+
+
+def iter_blocks(sample_size):
+    """Yield ``(block, start, stop)`` row ranges covering the dataset."""
+    for block, start in enumerate(range(0, sample_size, BLOCK_SIZE)):
+        yield block, start, min(start + BLOCK_SIZE, sample_size)
+
+
+def id_dtype(sample_size):
+    """Narrowest unsigned integer dtype that holds IDs 1..sample_size."""
+    return np.min_scalar_type(max(int(sample_size), 1))
+
+
+def has_missing(responses):
+    """Whether ``responses`` settings blank out any item responses."""
+    return bool(responses) and float(responses.get('missing_rate') or 0) > 0
+
+
+def ordinal_dtype():
+    """Ordered categorical dtype over the Likert levels."""
+    return pd.CategoricalDtype(LIKERT_LEVELS, ordered=True)
+
+
+def to_frame(items, variables, start=0, sample_size=None, ordinal=False, missing=False):
+    """Wrap an item matrix as a dataset frame with a 1-based ID column.
+
+    Items stay ``uint8`` (or become ordered categoricals with
+    ``ordinal=True``, still one byte per cell); the ID column uses the
+    narrowest dtype for ``sample_size`` rows. With ``missing=True`` the
+    ``MISSING_CODE`` cells become NaN in ``float32`` item columns
+    (categoricals: a missing category code).
+    """
+    columns = item_columns(variables)
+    if ordinal:
+        df = pd.DataFrame({
+            col: pd.Categorical.from_codes(items[:, j].astype(np.int8) - LIKERT_MIN, dtype=ordinal_dtype())
+            for j, col in enumerate(columns)
+        })
+    elif missing:
+        values = items.astype(MISSING_ITEM_DTYPE)
+        values[items == MISSING_CODE] = np.nan
+        df = pd.DataFrame(values, columns=columns, copy=False)
+    else:
+        df = pd.DataFrame(items, columns=columns, copy=False)
+    ids = np.arange(start + 1, start + len(df) + 1, dtype=id_dtype(sample_size or start + len(df)))
+    df.insert(0, 'ID', ids)
+    return df
+
+
+def _block_tasks(variables, relationships, sample_size, seed, noise, moderators, mediators, model, calibrate,
+                 responses=None):
+    options = {'moderators': list(moderators), 'mediators': list(mediators), 'model': model, 'calibrate': calibrate,
+               'responses': responses}
+    return [
+        (variables, relationships, stop - start, seed, block, noise, options)
+        for block, start, stop in iter_blocks(sample_size)
+    ]
+
+
+def generate_dataset(variables, relationships, sample_size, seed, noise=ITEM_NOISE, n_workers=1, ordinal=False,
+                     moderators=(), mediators=(), model='sem', calibrate=False, responses=None, progress=None):
+    """Generate the full survey dataset as a DataFrame (ID + item columns).
+
+    Blocks are generated on ``n_workers`` processes; every block has its
+    own seed stream, so the result is identical for any worker count.
+    ``calibrate=True`` discretizes items at solved thresholds so item means
+    and SDs match each construct's targets. ``responses`` adds missingness
+    and careless responders (see ``components.responses``); variables with
+    ``reverse`` item numbers get reverse-keyed items. ``progress`` is called with the
+    number of rows generated after every block; an exception it raises
+    stops generation and cancels the blocks not yet started.
+    """
+    items = np.empty((sample_size, len(item_columns(variables))), dtype=ITEM_DTYPE)
+    tasks = _block_tasks(variables, relationships, sample_size, seed, noise, moderators, mediators, model, calibrate,
+                         responses)
+    results = imap_ordered(generate_block, tasks, n_workers)
+    with stage('generation'), closing(results):
+        for (block, start, stop), block_items in zip(iter_blocks(sample_size), results):
+            items[start:stop] = block_items
+            if progress:
+                progress(stop)
+    with stage('frame build'):
+        return to_frame(items, variables, ordinal=ordinal, missing=has_missing(responses))
+
+
+def iter_dataset_chunks(variables, relationships, sample_size, seed, chunk_size=BLOCK_SIZE,
+                        noise=ITEM_NOISE, n_workers=1, ordinal=False,
+                        moderators=(), mediators=(), model='sem', calibrate=False, responses=None, id_rows=None):
+    """Yield the dataset as consecutive DataFrame chunks.
+
+    ``chunk_size`` is rounded up to a whole number of blocks; concatenating
+    the chunks gives exactly ``generate_dataset`` with the same arguments.
+    With ``n_workers > 1`` upcoming blocks are generated in parallel while
+    earlier chunks are consumed; closing the iterator early cancels them.
+    ``id_rows`` widens the ID dtype to hold that many rows (default
+    ``sample_size``), so datasets of different sizes can share a schema.
+    """
+    blocks_per_chunk = max(1, -(-int(chunk_size) // BLOCK_SIZE))
+    tasks = _block_tasks(variables, relationships, sample_size, seed, noise, moderators, mediators, model, calibrate,
+                         responses)
+    results = imap_ordered(generate_block, tasks, n_workers, max_pending=max(2 * n_workers, blocks_per_chunk))
+    missing = has_missing(responses)
+    id_size = max(sample_size, id_rows or 0)
+
+    with closing(results):
+        for start in range(0, sample_size, blocks_per_chunk * BLOCK_SIZE):
+            n_blocks = min(blocks_per_chunk, len(tasks) - start // BLOCK_SIZE)
+            with stage('generation'):
+                items = np.concatenate([next(results) for _ in range(n_blocks)])
+            with stage('frame build'):
+                chunk = to_frame(items, variables, start=start, sample_size=id_size, ordinal=ordinal,
+                                 missing=missing)
+            yield chunk
@@ -0,0 +1,139 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+# ===============================================================
+# 🧵 Background Jobs with Progress and Cooperative Cancellation
+# ---------------------------------------------------------------
+# Long computations run on a small thread pool instead of the
+# caller's (e.g. a Streamlit script) thread. The work reports its
+# progress through ``job.update``, which is also where it stops:
+# once a job is cancelled — or abandoned, i.e. nobody polled it
+# for a while — the next update raises ``JobCancelled``. NumPy
+# releases the GIL in the heavy kernels, so jobs run alongside
+# the app; process pools started by a job still do the bulk work.
+# ===============================================================
+
+class JobCancelled(Exception):
+    """Raised inside a job's work once cancellation was requested."""
+
+
+class Job:
+    """Handle on one unit of background work.
+
+    ``status`` moves from 'pending' to 'running' and ends as 'done',
+    'cancelled' or 'failed'; ``done`` / ``total`` and ``message`` describe
+    progress, and ``result`` or ``error`` are set when the job finishes. A
+    job that is not polled for ``abandon_after`` seconds cancels itself at
+    its next update.
+    """
+
+    def __init__(self, abandon_after=None):
+        self.id = uuid.uuid4().hex
+        self.status = 'pending'
+        self.done = 0
+        self.total = None
+        self.message = ''
+        self.result = None
+        self.error = None
+        self.abandon_after = abandon_after
+        self.submitted = time.monotonic()
+        self.started = None
+        self.finished_at = None
+        self._seen = self.submitted
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'cancelled', 'failed')
+
+    @property
+    def cancel_requested(self):
+        if self._cancel.is_set():
+            return True
+        return self.abandon_after is not None and time.monotonic() - self._seen > self.abandon_after
+
+    def cancel(self):
+        """Request cancellation; a job that has not started yet never runs."""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish('cancelled')
+
+    def update(self, done=None, total=None, message=None):
+        """Report progress from inside the work; raises ``JobCancelled`` if cancelled."""
+        if done is not None:
+            self.done = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        if self.cancel_requested:
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+    def poll(self):
+        """Progress snapshot; also marks the job as still watched."""
+        self._seen = time.monotonic()
+        end = self.finished_at or self._seen
+        return {
+            'status': self.status,
+            'done': self.done,
+            'total': self.total,
+            'fraction': min(self.done / self.total, 1.0) if self.total else 0.0,
+            'message': self.message,
+            'seconds': round(end - (self.started or end), 3),
+            'error': self.error,
+        }
+
+    def _finish(self, status, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.finished_at = time.monotonic()
+        self.status = status
+
+
+class JobRunner:
+    """Thread pool running ``Job`` s; ``submit(fn, *args)`` calls ``fn(job, *args)``."""
+
+    def __init__(self, max_workers=2, abandon_after=None):
+        self.abandon_after = abandon_after
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        job = Job(abandon_after=self.abandon_after)
+        with self._lock:
+            self._jobs[job.id] = job
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        job._future.add_done_callback(lambda _: self._forget(job.id))
+        return job
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            job._finish('cancelled')
+        else:
+            job.started = time.monotonic()
+            job.status = 'running'
+            try:
+                job._finish('done', result=fn(job, *args, **kwargs))
+            except JobCancelled:
+                job._finish('cancelled')
+            except Exception as exc:
+                job._finish('failed', error=f"{type(exc).__name__}: {exc}")
+
+    def active(self):
+        """Jobs that are queued or running."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.active():
+                job.cancel()
+        self._executor.shutdown(wait=True)
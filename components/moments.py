@@ -0,0 +1,175 @@
+import numpy as np
+
+# ===============================================================
+# ➕ Mergeable One-Pass Moment Accumulator
+# ---------------------------------------------------------------
+# Collects count, mean and the central moment sums M2, M3, M4 of
+# every column, plus cross-product (co-moment) matrices, in one
+# pass over row chunks. Partial results from separate chunks or
+# worker processes combine exactly with Pébay's pairwise update
+# formulas, so statistics of streamed or parallel datasets never
+# need the full data in memory.
+# ===============================================================
+
+
+class MomentAccumulator:
+    """Running per-column moments and grouped co-moments of a numeric matrix.
+
+    ``groups`` is an optional (G × k_max) index array of columns whose
+    cross-products are collected together; slots equal to ``n_columns``
+    are padding (the layout of ``construct_layout``). By default all
+    columns form one group, i.e. the full co-moment matrix is kept; pass
+    ``np.arange(n_columns)[:, None]`` to skip cross-products entirely.
+
+    Missing values (NaN) are skipped group-wise: each group only counts
+    the rows that are complete on its columns, so ``count`` is kept per
+    column. With missing values the groups must not overlap.
+    """
+
+    def __init__(self, n_columns, groups=None):
+        self.n_columns = n_columns
+        self.groups = np.arange(n_columns)[None, :] if groups is None else np.asarray(groups)
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.m3 = np.zeros(n_columns)
+        self.m4 = np.zeros(n_columns)
+        self.comoments = np.zeros((len(self.groups),) + (self.groups.shape[1],) * 2)
+
+    def _gather(self, values):
+        # Group-wise view of per-column values; padding slots read as zero
+        return np.append(values, 0.0)[self.groups]
+
+    def _group_count(self):
+        # Columns of a group share their rows, so its first column's count is the group's
+        return self.count[self.groups[:, 0]]
+
+    def update(self, block):
+        """Add the rows of an (n × n_columns) block; returns ``self``."""
+        block = np.asarray(block, dtype=float)
+        if len(block):
+            self.merge(self.from_block(block, self.groups))
+        return self
+
+    @classmethod
+    def from_block(cls, block, groups=None):
+        """Exact (two-pass) moments of one in-memory block."""
+        block = np.asarray(block)
+        acc = cls(block.shape[1], groups)
+        if block.dtype.kind == 'f' and np.isnan(block).any():
+            return acc._from_incomplete(block)
+        acc.count = np.full(acc.n_columns, float(len(block)))
+        acc.mean = block.mean(axis=0, dtype=float)
+        dev = np.subtract(block, acc.mean, dtype=float)
+        dev2 = dev * dev
+        acc.m2 = dev2.sum(axis=0)
+        acc.m3 = np.einsum('ij,ij->j', dev2, dev)
+        acc.m4 = np.einsum('ij,ij->j', dev2, dev2)
+
+        # One BLAS product per group; groups of adjacent columns are sliced
+        # rather than copied out
+        for g, row in enumerate(acc.groups):
+            cols = row[row < acc.n_columns]
+            k = len(cols)
+            if k and (np.diff(cols) == 1).all():
+                part = dev[:, cols[0]:cols[0] + k]
+            else:
+                part = dev[:, cols]
+            acc.comoments[g, :k, :k] = part.T @ part
+        return acc
+
+    def _from_incomplete(self, block):
+        # Every group from the rows complete on its own columns
+        for g, row in enumerate(self.groups):
+            cols = row[row < self.n_columns]
+            values = block[:, cols]
+            part = type(self).from_block(values[~np.isnan(values).any(axis=1)])
+            self.count[cols] = part.count
+            self.mean[cols] = part.mean
+            self.m2[cols], self.m3[cols], self.m4[cols] = part.m2, part.m3, part.m4
+            self.comoments[g, :len(cols), :len(cols)] = part.comoments[0]
+        return self
+
+    def merge(self, other):
+        """Fold in another accumulator over the same columns (Pébay, 2008); returns ``self``."""
+        if not other.count.any():
+            return self
+        if not self.count.any():
+            self.count, self.mean = other.count.copy(), other.mean.copy()
+            self.m2, self.m3, self.m4 = other.m2.copy(), other.m3.copy(), other.m4.copy()
+            self.comoments = other.comoments.copy()
+            return self
+
+        na, nb = self.count, other.count
+        # Columns without rows on either side stay zero
+        n = np.where(na + nb > 0, na + nb, 1.0)
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+
+        m4 = (self.m4 + other.m4
+              + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        m3 = (self.m3 + other.m3
+              + delta2 * delta * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+
+        shift = self._gather(delta)
+        weight = (na * nb / n)[self.groups[:, 0], None, None]
+        self.comoments = self.comoments + other.comoments + shift[:, :, None] * shift[:, None, :] * weight
+        self.mean = self.mean + delta * nb / n
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.count = na + nb
+        return self
+
+    def pooled(self):
+        """Moments of each group's columns pooled into one sample per group.
+
+        Returns ``count``, ``mean``, ``m2``, ``m3`` and ``m4`` arrays over
+        groups, as if the group's columns were one long column.
+        """
+        valid = self.groups < self.n_columns
+        width = valid.sum(axis=1)
+        mean = (self._gather(self.mean) * valid).sum(axis=1) / width
+        shift = (self._gather(self.mean) - mean[:, None]) * valid
+        m2, m3, m4 = self._gather(self.m2), self._gather(self.m3), self._gather(self.m4)
+        n = self._group_count()
+        return {
+            'count': n * width,
+            'mean': mean,
+            'm2': (m2 + n[:, None] * shift ** 2).sum(axis=1),
+            'm3': (m3 + 3 * shift * m2 + n[:, None] * shift ** 3).sum(axis=1),
+            'm4': (m4 + 4 * shift * m3 + 6 * shift ** 2 * m2 + n[:, None] * shift ** 4).sum(axis=1),
+        }
+
+    def statistics(self, pooled=False, bias=True):
+        """Mean, SD (ddof=1), skewness and excess kurtosis per column.
+
+        With ``pooled=True`` the statistics are per group instead. ``bias``
+        follows ``scipy.stats.skew``: True gives the population estimators,
+        False the sample-adjusted ones that pandas reports.
+        """
+        moments = self.pooled() if pooled else {
+            'count': self.count, 'mean': self.mean,
+            'm2': self.m2, 'm3': self.m3, 'm4': self.m4,
+        }
+        return describe_moments(**moments, bias=bias)
+
+    def covariances(self):
+        """Sample (ddof=1) covariance matrix of every group, (G × k_max × k_max)."""
+        return self.comoments / (self._group_count() - 1)[:, None, None]
+
+
+def describe_moments(count, mean, m2, m3, m4, bias=True):
+    """Mean, SD (ddof=1), skewness and excess kurtosis from central moment sums."""
+    n = np.asarray(count, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = m2 / n
+        sd = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+        skewness = np.where(variance > 0, m3 / n / variance ** 1.5, np.nan)
+        kurtosis = np.where(variance > 0, m4 / n / variance ** 2 - 3.0, np.nan)
+        if not bias:
+            skewness = np.where(n > 2, skewness * np.sqrt(n * (n - 1)) / (n - 2), np.nan)
+            kurtosis = np.where(n > 3, ((n + 1) * kurtosis + 6) * (n - 1) / ((n - 2) * (n - 3)), np.nan)
+    return {'mean': np.asarray(mean)[()], 'sd': sd[()], 'skewness': skewness[()], 'kurtosis': kurtosis[()]}
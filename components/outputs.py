@@ -0,0 +1,89 @@
+import shutil
+import time
+from pathlib import Path, PurePosixPath, PureWindowsPath
+
+# ===============================================================
+# 📁 Server-Side Output Directory (confined, expiring, bounded)
+# ---------------------------------------------------------------
+# Streamed exports and sweeps write below one root, in a folder
+# per owner (e.g. a Streamlit session). Names are relative and
+# may not leave that folder. Outputs expire after a TTL, and the
+# total size is capped: writers check the quota after every chunk
+# and stop with an error once it is exceeded.
+# ===============================================================
+
+
+class OutputQuotaExceeded(OSError):
+    """Raised when the output directory grows beyond its size budget."""
+
+
+def _size(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+
+
+class OutputDirectory:
+    """Confined, expiring and size-bounded directory for generated files.
+
+    ``path(name, owner)`` resolves a relative ``name`` inside ``root/owner``;
+    outputs not modified for ``ttl_seconds`` are removed by ``prune()``
+    and ``check()`` raises ``OutputQuotaExceeded`` once everything below
+    ``root`` takes more than ``max_bytes``.
+    """
+
+    def __init__(self, root, max_bytes=10 * 1024 ** 3, ttl_seconds=24 * 3600):
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+    def path(self, name, owner):
+        """``root/owner/name``; raises ``ValueError`` for absolute names, '..' or escapes."""
+        name = name.strip()
+        parts = PurePosixPath(name.replace('\\', '/')).parts
+        if not name or PurePosixPath(name).is_absolute() or PureWindowsPath(name).drive or '..' in parts:
+            raise ValueError(f"'{name}' must be a relative name inside the output directory, without '..'")
+        folder = (self.root / owner).resolve()
+        path = (folder / Path(*parts)).resolve()
+        if folder not in path.parents:
+            raise ValueError(f"'{name}' points outside the output directory")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def usage(self):
+        """Bytes taken by every output below ``root``."""
+        return _size(self.root)
+
+    def check(self):
+        """Raise ``OutputQuotaExceeded`` if the outputs exceed ``max_bytes``."""
+        used = self.usage()
+        if used > self.max_bytes:
+            raise OutputQuotaExceeded(f"The output directory is full ({used / 1024 ** 2:,.0f} MB of "
+                                      f"{self.max_bytes / 1024 ** 2:,.0f} MB); try again later")
+
+    def prune(self, now=None):
+        """Remove outputs (top-level entries of every owner folder) idle for ``ttl_seconds``."""
+        cutoff = (now or time.time()) - self.ttl_seconds
+        for folder in [p for p in self.root.iterdir() if p.is_dir()]:
+            for entry in list(folder.iterdir()):
+                try:
+                    files = [entry, *entry.rglob('*')] if entry.is_dir() else [entry]
+                    modified = max(p.stat().st_mtime for p in files)
+                except OSError:
+                    continue
+                if modified >= cutoff:
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry, ignore_errors=True)
+                else:
+                    entry.unlink(missing_ok=True)
+            try:
+                folder.rmdir()
+            except OSError:
+                pass  # not empty, or just written to again
+
+    def size(self, path):
+        """Bytes taken by one output file or folder."""
+        return _size(path)
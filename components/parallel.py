@@ -0,0 +1,48 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# ===============================================================
+# 🧵 Process-Pool Helpers
+# ---------------------------------------------------------------
+# Work is split into independent tasks (e.g. row blocks with their
+# own seed streams), so results never depend on the worker count.
+# ===============================================================
+
+
+def available_workers():
+    """Number of CPU cores usable by this process."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def imap_ordered(func, tasks, n_workers=1, max_pending=None):
+    """Yield ``func(*task)`` for every task, in task order.
+
+    With ``n_workers > 1`` the tasks run on a process pool; at most
+    ``max_pending`` results (default ``2 * n_workers``) are in flight at
+    once, so a consumer that writes results as they arrive keeps memory
+    bounded. Closing the iterator early cancels the tasks not yet started.
+    """
+    tasks = list(tasks)
+    if n_workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield func(*task)
+        return
+
+    max_pending = max_pending or 2 * n_workers
+    with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as pool:
+        pending = deque()
+        try:
+            for task in tasks:
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(func, *task))
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # A consumer that stops early (closed or failed) leaves no queued work behind
+            for future in pending:
+                future.cancel()
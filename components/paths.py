@@ -0,0 +1,225 @@
+import math
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from components.generator import child_rng
+from components.parallel import imap_ordered
+from components.profiling import stage
+from components.psychometrics import construct_layout, rekeyed
+
+# ===============================================================
+# 🔗 Path Estimation with Vectorized Bootstrap
+# ---------------------------------------------------------------
+# Standardized path coefficients are solved from one correlation
+# matrix of construct scores. The bootstrap draws each batch of
+# resample indices as one matrix, turns it into resample weights
+# and fits every replicate with batched linear algebra.
+# ===============================================================
+
+# Spawn-key tag that keeps bootstrap streams apart from data blocks
+BOOTSTRAP_STREAM = 0x626F6F74
+BOOTSTRAP_BATCH = 250
+
+
+def construct_scores(items, variables):
+    """Mean item score per construct, shape (n × n_constructs).
+
+    Reverse-keyed items are re-keyed first. Missing (NaN) responses are
+    left out of a respondent's mean; a construct with no answered item
+    scores NaN.
+    """
+    if isinstance(items, pd.DataFrame):
+        items = items.drop(columns='ID', errors='ignore').to_numpy()
+    items = rekeyed(np.asarray(items), variables)
+    _, counts = construct_layout(variables)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    if items.dtype.kind == 'f' and np.isnan(items).any():
+        answered = ~np.isnan(items)
+        sums = np.add.reduceat(np.where(answered, items, 0.0), starts, axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return sums / np.add.reduceat(answered, starts, axis=1)
+    return np.add.reduceat(items, starts, axis=1, dtype=float) / counts
+
+
+def path_equations(variables, relationships):
+    """Group relationships into regressions: ``[(target, [predictors])]`` by index.
+
+    Paths with unknown endpoints, self-loops and duplicates (see
+    ``duplicate_paths``) are skipped.
+    """
+    name_index = {v['name']: i for i, v in enumerate(variables)}
+    equations = {}
+    for rel in relationships:
+        src, dst = name_index.get(rel['from']), name_index.get(rel['to'])
+        if src is None or dst is None or src == dst:
+            continue
+        predictors = equations.setdefault(dst, [])
+        if src not in predictors:
+            predictors.append(src)
+    return list(equations.items())
+
+
+def duplicate_paths(relationships):
+    """``(from, to)`` pairs specified more than once, with the entry that is
+    used: the last one, as the latent models overwrite earlier entries."""
+    seen, duplicates = {}, {}
+    for rel in relationships:
+        key = (rel['from'], rel['to'])
+        if key in seen:
+            duplicates[key] = rel
+        seen[key] = rel
+    return duplicates
+
+
+def path_order(variables, relationships, equations):
+    """Coefficient pairs ``(src, target)`` in fitted order, plus the positions
+    that list them in the order the relationships were specified."""
+    name_index = {v['name']: i for i, v in enumerate(variables)}
+    pairs = [(src, target) for target, predictors in equations for src in predictors]
+    order = []
+    for rel in relationships:
+        key = (name_index.get(rel['from']), name_index.get(rel['to']))
+        if key in pairs and pairs.index(key) not in order:
+            order.append(pairs.index(key))
+    return pairs, np.array(order, dtype=int)
+
+
+def correlations_from_moments(sums, cross, n):
+    """Correlation matrices from (weighted) first and second moment sums.
+
+    ``sums`` is (..., k) and ``cross`` is (..., k, k); leading dimensions are
+    independent replicates.
+    """
+    mean = sums / n
+    cov = cross / n - mean[..., :, None] * mean[..., None, :]
+    scale = 1 / np.sqrt(np.diagonal(cov, axis1=-2, axis2=-1))
+    return cov * scale[..., :, None] * scale[..., None, :]
+
+
+def standardized_betas(corr, target, predictors):
+    """Standardized OLS coefficients of ``target`` on ``predictors`` for every
+    correlation matrix in the (..., k, k) stack, solved in one batched call."""
+    r_xx = corr[..., predictors, :][..., :, predictors]
+    r_xy = corr[..., predictors, target]
+    return np.linalg.solve(r_xx, r_xy[..., None])[..., 0]
+
+
+def _indirect_effects(corr, mediations):
+    effects = []
+    for iv, med, dv in mediations:
+        a = standardized_betas(corr, med, [iv])[..., 0]
+        b = standardized_betas(corr, dv, [med, iv])[..., 0]
+        effects.append(a * b)
+    return np.stack(effects, axis=-1) if effects else np.zeros(corr.shape[:-2] + (0,))
+
+
+def _fit_all(corr, equations, mediations):
+    betas = [standardized_betas(corr, target, predictors) for target, predictors in equations]
+    betas = np.concatenate(betas, axis=-1) if betas else np.zeros(corr.shape[:-2] + (0,))
+    return betas, _indirect_effects(corr, mediations)
+
+
+def _bootstrap_batch(scores, equations, mediations, n_boot, seed, batch):
+    n = len(scores)
+    rng = child_rng(seed, BOOTSTRAP_STREAM, batch)
+    indices = rng.integers(0, n, size=(n_boot, n))
+
+    # Resample weights: how often each row appears in each replicate
+    offsets = np.arange(n_boot)[:, None] * n
+    weights = np.bincount((indices + offsets).ravel(), minlength=n_boot * n).reshape(n_boot, n).astype(float)
+
+    k = scores.shape[1]
+    products = (scores[:, :, None] * scores[:, None, :]).reshape(n, k * k)
+    sums = weights @ scores
+    cross = (weights @ products).reshape(n_boot, k, k)
+    return _fit_all(correlations_from_moments(sums, cross, n), equations, mediations)
+
+
+def _p_value(t):
+    return math.erfc(abs(t) / math.sqrt(2)) if np.isfinite(t) else np.nan
+
+
+@stage('path estimation')
+def estimate_paths(scores, variables, relationships, mediators=(), n_boot=1000, seed=0,
+                   n_workers=1, alpha=0.05, batch_size=BOOTSTRAP_BATCH, progress=None):
+    """Estimate standardized path coefficients and mediator indirect effects.
+
+    Point estimates come from the full-sample correlation matrix of the
+    construct ``scores``. Standard errors, t-values (normal-theory
+    p-values) and percentile intervals come from ``n_boot`` bootstrap
+    replicates, fitted in batches of ``batch_size`` optionally spread over
+    ``n_workers`` processes. Every batch has its own seed stream, so the
+    results do not depend on the worker count. ``progress`` is called with
+    the number of replicates fitted after every batch; an exception it
+    raises stops the bootstrap.
+
+    Returns ``(paths, indirect)`` DataFrames.
+    """
+    scores = np.asarray(scores, dtype=float)
+    missing = np.isnan(scores).any(axis=1)
+    if missing.any():
+        # Respondents without a score on some construct are left out (listwise)
+        scores = scores[~missing]
+    names = [v['name'] for v in variables]
+    name_index = {name: i for i, name in enumerate(names)}
+    equations = path_equations(variables, relationships)
+    mediations = [
+        (name_index[m['iv']], name_index[m['mediator']], name_index[m['dv']])
+        for m in mediators
+        if {m['iv'], m['mediator'], m['dv']} <= name_index.keys() and len({m['iv'], m['mediator'], m['dv']}) == 3
+    ]
+
+    n = len(scores)
+    corr = correlations_from_moments(scores.sum(axis=0), scores.T @ scores, n)
+    betas, indirect = _fit_all(corr, equations, mediations)
+
+    boot_betas = np.zeros((0, betas.shape[-1]))
+    boot_indirect = np.zeros((0, indirect.shape[-1]))
+    if n_boot > 0:
+        tasks = [
+            (scores, equations, mediations, min(batch_size, n_boot - start), seed, batch)
+            for batch, start in enumerate(range(0, n_boot, batch_size))
+        ]
+        results = []
+        with closing(imap_ordered(_bootstrap_batch, tasks, n_workers)) as batches:
+            for result in batches:
+                results.append(result)
+                if progress:
+                    progress(sum(len(r[0]) for r in results))
+        boot_betas = np.concatenate([r[0] for r in results])
+        boot_indirect = np.concatenate([r[1] for r in results])
+
+    def summarize(estimates, replicates):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            se = replicates.std(axis=0, ddof=1) if len(replicates) > 1 else np.full(len(estimates), np.nan)
+            t_values = estimates / se
+        lower, upper = (np.quantile(replicates, [alpha / 2, 1 - alpha / 2], axis=0)
+                        if len(replicates) else np.full((2, len(estimates)), np.nan))
+        p_values = np.array([_p_value(t) for t in t_values])
+        return se, t_values, p_values, lower, upper
+
+    pairs, order = path_order(variables, relationships, equations)
+
+    se, t_values, p_values, _, _ = summarize(betas, boot_betas)
+    paths = pd.DataFrame({
+        'Path': [f"{names[pairs[i][0]]} → {names[pairs[i][1]]}" for i in order],
+        'β Coefficient': np.round(betas[order], 3),
+        'SE': np.round(se[order], 3),
+        't-value': np.round(t_values[order], 3),
+        'p-value': np.round(p_values[order], 4),
+        'Significant': np.where(p_values[order] < alpha, 'Yes', 'No'),
+    })
+
+    se, t_values, p_values, lower, upper = summarize(indirect, boot_indirect)
+    indirect_table = pd.DataFrame({
+        'Path': [f"{names[iv]} → {names[med]} → {names[dv]}" for iv, med, dv in mediations],
+        'Indirect Effect': np.round(indirect, 3),
+        'SE': np.round(se, 3),
+        't-value': np.round(t_values, 3),
+        'CI Lower': np.round(lower, 3),
+        'CI Upper': np.round(upper, 3),
+        'Significant': np.where((lower > 0) | (upper < 0), 'Yes', 'No'),
+    })
+    return paths, indirect_table
@@ -0,0 +1,129 @@
+import contextvars
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# ===============================================================
+# 🔬 Per-Stage Timing and Memory Instrumentation
+# ---------------------------------------------------------------
+# Pipeline code marks its stages with ``stage(name)``, which is a
+# no-op unless a ``Profiler`` is active in the current context.
+# An active profiler sums wall time and calls per stage and, with
+# tracemalloc, each stage's peak allocation above what was live
+# when it started. Nested stages are reported by path, e.g.
+# ``generation/latent sampling``. Reports are plain dicts, logged
+# as one JSON line per run.
+# ===============================================================
+
+logger = logging.getLogger('components.profiling')
+
+_ACTIVE = contextvars.ContextVar('active_profiler', default=None)
+
+
+class Profiler:
+    """Collects stage timings (and peak memory) while active.
+
+    Use as a context manager. Stages run in worker processes are not
+    seen; with ``n_workers > 1`` only the stages of the calling process
+    (e.g. statistics, export) are itemized. tracemalloc is process-wide,
+    so peaks include allocations made by other threads meanwhile.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.info = {}
+        self._open = []
+        self._token = None
+        self._started_tracing = False
+        self._started = None
+        self._elapsed = 0.0
+        self._peak = 0
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._token = _ACTIVE.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._elapsed += time.perf_counter() - self._started
+        if tracemalloc.is_tracing():
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        _ACTIVE.reset(self._token)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _observe_peak(self):
+        # Fold the peak since the last reset into every open stage
+        peak = tracemalloc.get_traced_memory()[1]
+        self._peak = max(self._peak, peak)
+        for frame in self._open:
+            frame['peak'] = max(frame['peak'], peak)
+
+    @contextmanager
+    def stage(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        frame = {'name': name, 'peak': 0, 'base': 0}
+        if tracing:
+            self._observe_peak()
+            tracemalloc.reset_peak()
+            frame['base'] = tracemalloc.get_traced_memory()[0]
+        self._open.append(frame)
+        path = '/'.join(f['name'] for f in self._open)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            if tracing:
+                self._observe_peak()
+            self._open.pop()
+            entry = self.stages.setdefault(path, {'seconds': 0.0, 'calls': 0, 'peak_bytes': 0})
+            entry['seconds'] += seconds
+            entry['calls'] += 1
+            entry['peak_bytes'] = max(entry['peak_bytes'], frame['peak'] - frame['base'])
+
+    def note(self, **info):
+        """Attach extra fields (dataset size, rows, config hash, …) to the report."""
+        self.info.update(info)
+
+    def report(self):
+        """JSON-serializable summary: info fields, totals and stages in first-run order."""
+        traced = self.trace_memory
+        return {
+            **self.info,
+            'total_seconds': round(self._elapsed, 6),
+            'peak_mb': round(self._peak / 1024 ** 2, 3) if traced else None,
+            'stages': [
+                {
+                    'stage': name,
+                    'seconds': round(entry['seconds'], 6),
+                    'calls': entry['calls'],
+                    'peak_mb': round(entry['peak_bytes'] / 1024 ** 2, 3) if traced else None,
+                }
+                for name, entry in self.stages.items()
+            ],
+        }
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block as ``name`` under the active profiler, if any."""
+    profiler = _ACTIVE.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+def log_profile(report, event='profile', level=logging.INFO):
+    """Emit a profiler report as one structured JSON log line."""
+    logger.log(level, json.dumps({'event': event, **report}, default=str))
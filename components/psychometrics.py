@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from components.generator import LIKERT_MAX, LIKERT_MIN, reverse_columns
+from components.moments import MomentAccumulator
+from components.profiling import stage
+
+# ===============================================================
+# 📐 Psychometric Statistics Engine
+# ---------------------------------------------------------------
+# Works directly on uint8 item matrices. One pass of a mergeable
+# moment accumulator yields the pooled construct moments and one
+# item covariance matrix per construct, which all reliability and
+# validity measures (alpha, loadings, CR, AVE) reuse.
+# ===============================================================
+
+# Rows converted to float at a time while accumulating covariances
+STATS_CHUNK_ROWS = 65_536
+
+
+def construct_layout(variables):
+    """Column index of every construct's items in the item matrix, padded.
+
+    Returns an (n_constructs × max_items) index array where padding slots
+    point one past the last item column, plus the item count per construct.
+    """
+    counts = np.array([int(v['items']) for v in variables])
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    max_items = counts.max() if len(counts) else 0
+    offsets = np.arange(max_items)
+    index = starts[:, None] + offsets
+    index[offsets >= counts[:, None]] = counts.sum()
+    return index, counts
+
+
+def construct_accumulator(variables):
+    """Empty moment accumulator for the item matrix of ``variables``.
+
+    Cross-products are kept only within each construct's items.
+    """
+    index, counts = construct_layout(variables)
+    return MomentAccumulator(int(counts.sum()), groups=index)
+
+
+def rekeyed(items, variables):
+    """Items with reverse-keyed columns mirrored back (a float copy), or ``items`` itself if there are none."""
+    columns = reverse_columns(variables)
+    if not columns:
+        return items
+    values = np.asarray(items, dtype=float).copy()
+    values[:, columns] = LIKERT_MIN + LIKERT_MAX - values[:, columns]
+    return values
+
+
+def accumulate_items(items, variables, accumulator=None, chunk_rows=STATS_CHUNK_ROWS):
+    """Feed an (n × total items) matrix into ``accumulator`` in row chunks.
+
+    Each chunk is widened to float once (re-keying reverse-keyed items on
+    the way); missing (NaN) responses drop the row from that construct
+    only. Returns the accumulator.
+    """
+    if accumulator is None:
+        accumulator = construct_accumulator(variables)
+    items = np.asarray(items)
+    for start in range(0, len(items), chunk_rows):
+        accumulator.update(rekeyed(items[start:start + chunk_rows], variables))
+    return accumulator
+
+
+def reliability_from_covariances(cov, counts):
+    """Cronbach's alpha, standardized loadings, CR and AVE per construct.
+
+    Loadings are the first principal component of each construct's item
+    correlation matrix (single-factor solution); constructs with the same
+    item count are decomposed together in one batched ``eigh``.
+    """
+    n_constructs = len(counts)
+    alpha = np.full(n_constructs, np.nan)
+    loadings = [None] * n_constructs
+
+    for k in np.unique(counts):
+        group = np.flatnonzero(counts == k)
+        block = cov[group][:, :k, :k]
+        variances = np.diagonal(block, axis1=1, axis2=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            alpha[group] = k / (k - 1) * (1 - variances.sum(axis=1) / block.sum(axis=(1, 2)))
+            scale = 1 / np.sqrt(variances)
+            corr = block * scale[:, :, None] * scale[:, None, :]
+        corr = np.nan_to_num(corr)
+        eigvals, eigvecs = np.linalg.eigh(corr)
+        first = eigvecs[:, :, -1] * np.sqrt(np.clip(eigvals[:, -1:], 0, None))
+        first *= np.where(first.sum(axis=1, keepdims=True) < 0, -1, 1)
+        for row, construct in enumerate(group):
+            loadings[construct] = first[row]
+
+    sum_loading = np.array([lam.sum() for lam in loadings])
+    sum_error = np.array([(1 - lam ** 2).sum() for lam in loadings])
+    return {
+        'alpha': alpha,
+        'loadings': loadings,
+        'avg_loading': np.array([lam.mean() for lam in loadings]),
+        'cr': sum_loading ** 2 / (sum_loading ** 2 + sum_error),
+        'ave': np.array([(lam ** 2).mean() for lam in loadings]),
+    }
+
+
+def column_statistics(df, chunk_rows=STATS_CHUNK_ROWS):
+    """Mean, SD, skewness and kurtosis of every numeric column, in one pass.
+
+    Matches ``DataFrame.mean/std/skew/kurtosis`` (sample-adjusted shape
+    statistics) without a separate scan per statistic.
+    """
+    numeric = df.select_dtypes(include=np.number)
+    values = numeric.to_numpy()
+    accumulator = MomentAccumulator(values.shape[1], groups=np.arange(values.shape[1])[:, None])
+    for start in range(0, len(values), chunk_rows):
+        accumulator.update(values[start:start + chunk_rows])
+    moments = accumulator.statistics(bias=False)
+    return pd.DataFrame({
+        'Mean': np.round(moments['mean'], 3),
+        'SD': np.round(moments['sd'], 3),
+        'Skewness': np.round(moments['skewness'], 3),
+        'Kurtosis': np.round(moments['kurtosis'], 3),
+    }, index=numeric.columns)
+
+
+def statistics_from_accumulator(accumulator, variables):
+    """Construct statistics table from accumulated item moments.
+
+    Means, SDs and shape statistics pool all items of a construct;
+    reliability and validity come from the within-construct covariances.
+    """
+    _, counts = construct_layout(variables)
+    moments = accumulator.statistics(pooled=True)
+    reliability = reliability_from_covariances(accumulator.covariances(), counts)
+
+    return pd.DataFrame({
+        'Construct': [v['name'] for v in variables],
+        'Mean': np.round(moments['mean'], 3),
+        'SD': np.round(moments['sd'], 3),
+        'Skewness': np.round(moments['skewness'], 3),
+        'Kurtosis': np.round(moments['kurtosis'], 3),
+        "Cronbach's α": np.round(reliability['alpha'], 3),
+        'Avg Loading': np.round(reliability['avg_loading'], 3),
+        'CR': np.round(reliability['cr'], 3),
+        'AVE': np.round(reliability['ave'], 3),
+    })
+
+
+@stage('statistics')
+def construct_statistics(items, variables):
+    """Descriptive, reliability and validity statistics per construct.
+
+    ``items`` is the (n × total items) Likert matrix in construct order
+    (a dataset frame's item columns, or the frame itself with an ID column).
+    All statistics come from one pass over the rows; each construct uses
+    the respondents who answered all of its items.
+    """
+    if isinstance(items, pd.DataFrame):
+        items = items.drop(columns='ID', errors='ignore').to_numpy()
+    return statistics_from_accumulator(accumulate_items(items, variables), variables)
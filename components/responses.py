@@ -0,0 +1,153 @@
+import numpy as np
+
+from components.generator import ITEM_DTYPE, LIKERT_MAX, LIKERT_MIN, MISSING_CODE, has_missing, reverse_columns
+from components.psychometrics import construct_layout
+
+# ===============================================================
+# 🧩 Response Patterns (reverse keying, careless rows, missingness)
+# ---------------------------------------------------------------
+# A post-processing stage applied to every generated block of the
+# uint8 item matrix with whole-array masks and in-place updates:
+#   1. reverse-keyed items are mirrored on the Likert scale,
+#   2. straightliners answer every item with one level and random
+#      responders answer uniformly at random,
+#   3. responses go missing completely at random (MCAR) or with a
+#      probability that rises with an observed construct (MAR).
+# It runs per block from the block's own random stream, so it
+# streams and parallelizes exactly like generation itself.
+# ===============================================================
+
+MISSING_MECHANISMS = ('mcar', 'mar')
+
+RESPONSE_DEFAULTS = {
+    'missing_rate': 0.0,
+    'missing_mechanism': 'mcar',
+    # MAR: construct whose observed score drives the missingness of the other items
+    'missing_driver': None,
+    'straightlining_rate': 0.0,
+    'random_rate': 0.0,
+}
+
+# Change of the log MAR missingness weight per SD of the driver score
+MAR_SLOPE = 1.0
+# Passes that move MAR probability mass capped at 1 onto the other rows
+MAR_RESCALE_ROUNDS = 20
+
+
+def normalize_responses(responses, variables):
+    """Validate response-pattern settings and fill in defaults; raises ``ValueError``."""
+    unknown = set(responses or {}) - set(RESPONSE_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown response settings: {', '.join(sorted(unknown))}")
+    settings = {**RESPONSE_DEFAULTS, **(responses or {})}
+    for key in ('missing_rate', 'straightlining_rate', 'random_rate'):
+        settings[key] = float(settings[key])
+        if not 0 <= settings[key] <= 1:
+            raise ValueError(f"'{key}' must be between 0 and 1")
+    if settings['straightlining_rate'] + settings['random_rate'] > 1:
+        raise ValueError("'straightlining_rate' and 'random_rate' add up to more than 1")
+    if settings['missing_mechanism'] not in MISSING_MECHANISMS:
+        raise ValueError(f"Unknown missingness mechanism '{settings['missing_mechanism']}'; "
+                         f"expected one of {MISSING_MECHANISMS}")
+    if settings['missing_mechanism'] == 'mar' and has_missing(settings):
+        names = [v['name'] for v in variables]
+        if settings['missing_driver'] not in names:
+            raise ValueError("MAR missingness needs 'missing_driver' set to one of the constructs "
+                             f"({', '.join(names)})")
+    return settings
+
+
+def responses_active(variables, responses):
+    """Whether the response stage changes anything for these settings."""
+    if reverse_columns(variables):
+        return True
+    return bool(responses) and any(
+        float(responses.get(key) or 0) > 0 for key in ('missing_rate', 'straightlining_rate', 'random_rate')
+    )
+
+
+def reverse_items(items, columns):
+    """Mirror ``columns`` of a uint8 item matrix on the Likert scale, in place."""
+    if columns:
+        items[:, columns] = LIKERT_MIN + LIKERT_MAX - items[:, columns]
+    return items
+
+
+def careless_rows(items, straightlining_rate, random_rate, rng):
+    """Turn rows into straightliners or random responders, in place.
+
+    Every row is one or the other (or neither) with the given
+    probabilities; returns the boolean row masks of both groups.
+    """
+    draw = rng.random(len(items))
+    straight = draw < straightlining_rate
+    random = (draw >= straightlining_rate) & (draw < straightlining_rate + random_rate)
+    n_straight, n_random = np.count_nonzero(straight), np.count_nonzero(random)
+    if n_straight:
+        items[straight] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(n_straight, 1), dtype=ITEM_DTYPE)
+    if n_random:
+        items[random] = rng.integers(LIKERT_MIN, LIKERT_MAX + 1, size=(n_random, items.shape[1]), dtype=ITEM_DTYPE)
+    return straight, random
+
+
+def missing_probability(items, variables, settings):
+    """Per-row probability that an item response is missing.
+
+    MCAR: the rate itself. MAR: weights ``exp(s·z)`` scaled so that their
+    mean over the block equals the rate (capped at 1, with the excess
+    spread over the other rows), where ``z`` is the driver construct's
+    observed score standardized within the block, so that rows scoring
+    high on the driver skip more items.
+    """
+    rate = settings['missing_rate']
+    if settings['missing_mechanism'] == 'mcar':
+        return np.full(len(items), rate)
+
+    position = [v['name'] for v in variables].index(settings['missing_driver'])
+    index, counts = construct_layout(variables)
+    columns = index[position, :counts[position]]
+    flip = np.isin(columns, reverse_columns(variables))
+    values = items[:, columns].astype(float)
+    values[:, flip] = LIKERT_MIN + LIKERT_MAX - values[:, flip]
+    score = values.mean(axis=1)
+    spread = score.std()
+    z = (score - score.mean()) / spread if spread > 0 else np.zeros(len(score))
+    weights = np.exp(MAR_SLOPE * z)
+    probability = rate * weights / weights.mean()
+    # Cap at 1 and move the capped mass onto the remaining rows
+    for _ in range(MAR_RESCALE_ROUNDS):
+        capped = probability >= 1
+        if not capped.any() or capped.all():
+            break
+        probability[capped] = 1.0
+        remaining = rate * len(probability) - np.count_nonzero(capped)
+        probability[~capped] *= remaining / probability[~capped].sum()
+    return np.minimum(probability, 1.0)
+
+
+def blank_responses(items, variables, settings, rng):
+    """Set item responses to ``MISSING_CODE`` following ``settings``, in place; returns the cell mask."""
+    probability = missing_probability(items, variables, settings)
+    mask = rng.random(items.shape, dtype=np.float32) < probability[:, None].astype(np.float32)
+    if settings['missing_mechanism'] == 'mar':
+        # The driver stays observed, otherwise the data would be missing not at random
+        position = [v['name'] for v in variables].index(settings['missing_driver'])
+        index, counts = construct_layout(variables)
+        mask[:, index[position, :counts[position]]] = False
+    items[mask] = MISSING_CODE
+    return mask
+
+
+def apply_responses(items, variables, responses, rng):
+    """Apply reverse keying, careless responding and missingness to an item block in place.
+
+    ``items`` is a block of the uint8 matrix (rows × ``item_columns``);
+    ``responses`` holds ``RESPONSE_DEFAULTS`` keys. Returns ``items``.
+    """
+    settings = {**RESPONSE_DEFAULTS, **(responses or {})}
+    reverse_items(items, reverse_columns(variables))
+    if settings['straightlining_rate'] > 0 or settings['random_rate'] > 0:
+        careless_rows(items, settings['straightlining_rate'], settings['random_rate'], rng)
+    if has_missing(settings):
+        blank_responses(items, variables, settings, rng)
+    return items
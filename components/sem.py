@@ -0,0 +1,180 @@
+import numpy as np
+
+from components.cache import LRUCache, config_hash
+from components.covariance import name_index
+
+# ===============================================================
+# 🏗️ Structural-Equation Latent Generator
+# ---------------------------------------------------------------
+# Orders the path graph topologically and builds latent scores as
+# structural equations, one layer at a time: direct paths, mediator
+# chains and moderator interaction terms are whole-column vector
+# operations. Residual variances are solved so every construct has
+# unit variance, and the implied covariance uses the closed form
+# Σ = (I − B)⁻¹ Ψ (I − B)⁻ᵀ.
+# ===============================================================
+
+# Smallest residual variance allowed when paths explain "too much"
+MIN_RESIDUAL_VARIANCE = 0.01
+
+MODEL_CACHE = LRUCache(max_entries=64, max_bytes=256 * 1024 ** 2)
+
+
+def _path_matrix(variables, relationships, mediators):
+    """B[to, from] = standardized path coefficient, mediator chains included."""
+    index = name_index(variables)
+    k = len(index)
+    paths = np.zeros((k, k))
+    specified = np.zeros((k, k), dtype=bool)
+
+    for rel in relationships:
+        src, dst = index.get(rel['from']), index.get(rel['to'])
+        if src is None or dst is None or src == dst:
+            continue
+        paths[dst, src] = rel['coefficient']
+        specified[dst, src] = True
+
+    # A mediator adds the iv → mediator → dv chain (a·b = indirect); a path
+    # the user already set keeps its value and the other leg absorbs the rest
+    for med in mediators:
+        iv, mid, dv = index.get(med['iv']), index.get(med['mediator']), index.get(med['dv'])
+        if None in (iv, mid, dv) or len({iv, mid, dv}) < 3:
+            continue
+        indirect = float(med['indirect'])
+        if specified[mid, iv] and specified[dv, mid]:
+            continue
+        if specified[mid, iv]:
+            a = paths[mid, iv]
+            paths[dv, mid] = indirect / a if a else 0.0
+        elif specified[dv, mid]:
+            b = paths[dv, mid]
+            paths[mid, iv] = indirect / b if b else 0.0
+        else:
+            a = np.sign(indirect) * np.sqrt(abs(indirect))
+            paths[mid, iv], paths[dv, mid] = a, np.sqrt(abs(indirect))
+        specified[mid, iv] = specified[dv, mid] = True
+
+    return paths, specified
+
+
+def _interactions(variables, moderators):
+    """Moderator terms as index arrays (iv, moderator, dv) plus effect sizes."""
+    index = name_index(variables)
+    terms = [
+        (index[m['iv']], index[m['moderator']], index[m['dv']], float(m['effect']))
+        for m in moderators
+        if {m['iv'], m['moderator'], m['dv']} <= index.keys() and len({m['iv'], m['moderator'], m['dv']}) == 3
+    ]
+    if not terms:
+        return np.zeros((4, 0))
+    return np.array(terms, dtype=float).T
+
+
+def topological_layers(dependencies):
+    """Group nodes into layers so every node comes after all of its parents.
+
+    ``dependencies`` is a boolean (k × k) matrix with ``[child, parent]``
+    set. Raises ``ValueError`` if the graph has a cycle.
+    """
+    remaining = np.ones(len(dependencies), dtype=bool)
+    layers = []
+    while remaining.any():
+        ready = remaining & ~(dependencies[:, remaining].any(axis=1))
+        if not ready.any():
+            raise ValueError("The path model contains a cycle; structural paths must form a DAG")
+        layers.append(np.flatnonzero(ready))
+        remaining &= ~ready
+    return layers
+
+
+def implied_covariance(paths, residual_variances):
+    """Closed-form Σ = (I − B)⁻¹ Ψ (I − B)⁻ᵀ for diagonal Ψ."""
+    inverse = np.linalg.inv(np.eye(len(paths)) - paths)
+    return (inverse * residual_variances) @ inverse.T
+
+
+def compile_model(variables, relationships, moderators=(), mediators=(), cache=MODEL_CACHE):
+    """Structural model ready for sampling, cached per configuration.
+
+    Returns a dict with the path matrix ``B``, interaction terms, the
+    ``interaction_means`` E[X·M] = ρ their products are centered by, the
+    topological ``layers``, residual variances ``psi`` (linear disturbance)
+    and the implied covariance ``sigma`` of the standardized latents, plus
+    the names of constructs whose paths had to be capped (``inadmissible``).
+    """
+    def compute():
+        paths, specified = _path_matrix(variables, relationships, mediators)
+        iv, mod, dv, effect = _interactions(variables, moderators)
+        iv, mod, dv = iv.astype(int), mod.astype(int), dv.astype(int)
+
+        dependencies = specified.copy()
+        dependencies[dv, iv] = True
+        dependencies[dv, mod] = True
+        layers = topological_layers(dependencies)
+
+        # Solve residual variances layer by layer so every latent has unit
+        # variance; centered products of standard normals X·M − ρ have
+        # variance 1 + ρ², and two products on one outcome covary by
+        # Cov(X₁M₁, X₂M₂) = σ(X₁,X₂)σ(M₁,M₂) + σ(X₁,M₂)σ(M₁,X₂)
+        k = len(paths)
+        psi = np.ones(k)
+        interaction_variance = np.zeros(k)
+        inadmissible = []
+        for layer in layers[1:]:
+            sigma = implied_covariance(paths, psi + interaction_variance)
+            explained = np.einsum('ij,jk,ik->i', paths[layer], sigma, paths[layer])
+            terms = np.flatnonzero(np.isin(dv, layer))
+            t_iv, t_mod, t_dv = iv[terms], mod[terms], dv[terms]
+            product_cov = (sigma[np.ix_(t_iv, t_iv)] * sigma[np.ix_(t_mod, t_mod)]
+                           + sigma[np.ix_(t_iv, t_mod)] * sigma[np.ix_(t_mod, t_iv)])
+            product_cov *= np.outer(effect[terms], effect[terms]) * (t_dv[:, None] == t_dv[None, :])
+            np.add.at(interaction_variance, t_dv, product_cov.sum(axis=1))
+            residual = 1 - explained - interaction_variance[layer]
+            inadmissible.extend(layer[residual < MIN_RESIDUAL_VARIANCE])
+            psi[layer] = np.maximum(residual, MIN_RESIDUAL_VARIANCE)
+
+        sigma = implied_covariance(paths, psi + interaction_variance)
+        return {
+            'B': paths,
+            'interactions': (iv, mod, dv, effect),
+            'interaction_means': sigma[iv, mod],
+            'layers': layers,
+            'psi': psi,
+            'sigma': sigma,
+            'inadmissible': [variables[i]['name'] for i in sorted(inadmissible)],
+        }
+
+    if cache is None:
+        return compute()
+    config = {
+        'variables': [v['name'] for v in variables],
+        'relationships': [(r['from'], r['to'], float(r['coefficient'])) for r in relationships],
+        'moderators': [(m['moderator'], m['iv'], m['dv'], float(m['effect'])) for m in moderators],
+        'mediators': [(m['mediator'], m['iv'], m['dv'], float(m['indirect'])) for m in mediators],
+    }
+    return cache.get_or_compute(config_hash(config), compute)
+
+
+def sample_structural(model, sample_size, rng):
+    """Draw standardized latent scores (sample_size × k) from a compiled model.
+
+    Each topological layer is one matmul over the already generated
+    columns, one vectorized block of centered interaction products (so
+    moderated outcomes keep mean 0) and one disturbance column block.
+    """
+    paths, psi = model['B'], model['psi']
+    iv, mod, dv, effect = model['interactions']
+    disturbance = rng.standard_normal(size=(sample_size, len(psi)))
+    disturbance *= np.sqrt(psi)
+
+    eta = np.zeros((sample_size, len(psi)))
+    for layer in model['layers']:
+        eta[:, layer] = eta @ paths[layer].T + disturbance[:, layer]
+        terms = np.flatnonzero(np.isin(dv, layer))
+        if len(terms):
+            products = eta[:, iv[terms]] * eta[:, mod[terms]]
+            products -= model['interaction_means'][terms]
+            products *= effect[terms]
+            selector = (dv[terms][:, None] == layer[None, :]).astype(float)
+            eta[:, layer] += products @ selector
+    return eta
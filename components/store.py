@@ -0,0 +1,208 @@
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ===============================================================
+# 🗄️ Shared Dataset Store (deduplicated, disk-spilling)
+# ---------------------------------------------------------------
+# One store per server process holds every generated dataset once,
+# keyed on its config hash, so sessions that ask for the same data
+# share it. Sessions keep only a ``DatasetHandle``. Item matrices
+# above a size threshold are spilled to memory-mapped .npy files,
+# and entries are evicted by idle time (TTL) and by memory / disk
+# budgets; an evicted dataset is regenerated from its handle.
+# ===============================================================
+
+
+def _remove_spills(root, directories, remove_root):
+    for directory in list(directories):
+        shutil.rmtree(directory, ignore_errors=True)
+    directories.clear()
+    if remove_root:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+class DatasetHandle(namedtuple('DatasetHandle', ('key', 'config', 'rows'))):
+    """Lightweight session reference to a stored dataset.
+
+    ``key`` is the dataset's config hash, ``config`` the (API-shaped) model
+    config that regenerates it and ``rows`` its number of respondents.
+    """
+
+    __slots__ = ()
+
+
+class DatasetStore:
+    """Thread-safe store of dataset frames shared by all sessions.
+
+    Frames are kept as an item matrix plus ID column; matrices of at
+    least ``spill_bytes`` live in ``root`` as memory-mapped files and only
+    count against ``max_disk_bytes``. Frames with ordinal (categorical)
+    items are kept as they are, in memory. Entries idle for ``ttl_seconds``
+    or pushed out by the budgets (least recently used first) are dropped.
+    Spilled files are removed by ``close()``, or when the store is
+    garbage-collected or the interpreter exits; so is ``root`` if the store
+    created it.
+    """
+
+    def __init__(self, root=None, max_memory_bytes=256 * 1024 ** 2, max_disk_bytes=4 * 1024 ** 3,
+                 ttl_seconds=3600, spill_bytes=8 * 1024 ** 2, max_entries=256):
+        self.root = Path(root) if root else Path(tempfile.mkdtemp(prefix='datag-store-'))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._spilled = set()
+        self._finalizer = weakref.finalize(self, _remove_spills, self.root, self._spilled, root is None)
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self.spill_bytes = spill_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def memory_bytes(self):
+        return sum(e['bytes'] for e in self._entries.values() if e['path'] is None)
+
+    @property
+    def disk_bytes(self):
+        return sum(e['bytes'] for e in self._entries.values() if e['path'] is not None)
+
+    def _frame(self, entry):
+        if entry['frame'] is not None:
+            return entry['frame']
+        df = pd.DataFrame(entry['items'], columns=entry['columns'], copy=False)
+        df.insert(0, 'ID', entry['ids'])
+        return df
+
+    def _spill(self, key, items, ids):
+        # A fresh directory per spill: frames of a replaced entry may still map the old files
+        directory = Path(tempfile.mkdtemp(prefix=f'{key[:16]}-', dir=self.root))
+        self._spilled.add(directory)
+        for name, array in (('items', items), ('ids', ids)):
+            mapped = np.lib.format.open_memmap(directory / f'{name}.npy', mode='w+',
+                                               dtype=array.dtype, shape=array.shape)
+            mapped[:] = array
+            mapped.flush()
+            del mapped
+        return (directory,
+                np.load(directory / 'items.npy', mmap_mode='r'),
+                np.load(directory / 'ids.npy', mmap_mode='r'))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        if entry['path'] is not None:
+            # Frames still mapping the files keep working until released
+            shutil.rmtree(entry['path'], ignore_errors=True)
+            self._spilled.discard(entry['path'])
+
+    def _expire(self, now):
+        for key in [k for k, e in self._entries.items() if now - e['used'] > self.ttl_seconds]:
+            self._drop(key)
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or self.memory_bytes > self.max_memory_bytes
+                or self.disk_bytes > self.max_disk_bytes):
+            self._drop(next(iter(self._entries)))
+
+    def get(self, key):
+        """Frame stored under ``key`` (a read-only view), or ``None``."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry['used'] = now
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._frame(entry)
+
+    def put(self, key, df):
+        """Store ``df`` (ID + one item dtype) under ``key``; returns the stored view."""
+        if any(not isinstance(dtype, np.dtype) or dtype.kind == 'O' for dtype in df.dtypes):
+            # Ordinal frames would become object arrays, which cannot be memory-mapped
+            entry = {'frame': df, 'bytes': int(df.memory_usage(index=True, deep=True).sum()), 'path': None}
+        else:
+            items = np.ascontiguousarray(df.drop(columns='ID').to_numpy())
+            ids = df['ID'].to_numpy()
+            path = None
+            if items.nbytes >= self.spill_bytes:
+                path, items, ids = self._spill(key, items, ids)
+            entry = {
+                'frame': None,
+                'items': items,
+                'ids': ids,
+                'columns': list(df.columns.drop('ID')),
+                'bytes': items.nbytes + ids.nbytes,
+                'path': path,
+            }
+        entry['used'] = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._expire(entry['used'])
+            self._evict()
+        return self._frame(entry)
+
+    def get_or_compute(self, key, compute):
+        """Stored frame for ``key``, computing it once even under concurrent requests."""
+        df = self.get(key)
+        if df is not None:
+            return df
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                df = self.get(key)
+                if df is None:
+                    df = self.put(key, compute())
+        finally:
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return df
+
+    def open(self, handle, n_workers=1):
+        """Frame of a session's ``handle``, regenerated if it was evicted."""
+        from components.api import generate
+
+        return self.get_or_compute(handle.key, lambda: generate(handle.config, n_workers=n_workers))
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def close(self):
+        """Drop every dataset and remove the spill files (and a temporary ``root``)."""
+        self.clear()
+        self._finalizer()
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'memory_mb': round(self.memory_bytes / 1024 ** 2, 3),
+            'disk_mb': round(self.disk_bytes / 1024 ** 2, 3),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
@@ -0,0 +1,146 @@
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+
+from components.export import CSV_FLOAT_FORMAT, require_pyarrow
+from components.generator import (BLOCK_SIZE, ITEM_DTYPE, ITEM_NOISE, MISSING_ITEM_DTYPE, has_missing, item_columns,
+                                  iter_dataset_chunks)
+from components.profiling import stage
+from components.psychometrics import accumulate_items
+
+# ===============================================================
+# 💾 Chunked Streaming Generation (bounded memory)
+# ---------------------------------------------------------------
+# Generates the dataset chunk by chunk and appends every chunk
+# straight to a CSV, Parquet, Feather (Arrow IPC) or NPY file, so
+# peak memory depends on
+# the chunk size rather than the number of respondents.
+# ===============================================================
+
+STREAM_FORMATS = ('csv', 'parquet', 'feather', 'npy')
+DEFAULT_CHUNK_SIZE = 10 * BLOCK_SIZE
+
+
+def infer_format(path):
+    """File format from the path suffix (``.csv``, ``.parquet``, ``.feather``, ``.npy``)."""
+    fmt = Path(path).suffix.lstrip('.').lower()
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}'; expected one of {STREAM_FORMATS}")
+    return fmt
+
+
+def _write_csv(path, chunks, progress):
+    rows = 0
+    with open(path, 'w', newline='') as fh:
+        for chunk in chunks:
+            with stage('write csv'):
+                chunk.to_csv(fh, header=rows == 0, index=False, float_format=CSV_FLOAT_FORMAT)
+            rows += len(chunk)
+            progress(rows)
+    return rows
+
+
+def _write_parquet(path, chunks, progress, compression='zstd'):
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            with stage('write parquet'):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression=compression, use_dictionary=True)
+                writer.write_table(table)
+            rows += len(chunk)
+            progress(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_feather(path, chunks, progress, compression=None):
+    require_pyarrow()
+    import pyarrow as pa
+
+    rows = 0
+    writer = None
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    try:
+        for chunk in chunks:
+            with stage('write feather'):
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pa.ipc.new_file(path, table.schema, options=options)
+                writer.write_table(table)
+            rows += len(chunk)
+            progress(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_npy(path, chunks, progress, shape, dtype=ITEM_DTYPE):
+    # The header needs the final shape, so the file is preallocated and
+    # filled chunk by chunk through a memory map.
+    matrix = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    rows = 0
+    try:
+        for chunk in chunks:
+            with stage('write npy'):
+                matrix[rows:rows + len(chunk)] = chunk.drop(columns='ID').to_numpy()
+            rows += len(chunk)
+            progress(rows)
+        matrix.flush()
+    finally:
+        del matrix
+    return rows
+
+
+def _accumulated(chunks, variables, accumulator):
+    for chunk in chunks:
+        with stage('statistics'):
+            accumulate_items(chunk.drop(columns='ID').to_numpy(), variables, accumulator)
+        yield chunk
+
+
+def write_dataset(path, variables, relationships, sample_size, seed,
+                  fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, noise=ITEM_NOISE, n_workers=1, progress=None,
+                  moderators=(), mediators=(), model='sem', calibrate=False, responses=None, accumulator=None,
+                  id_rows=None):
+    """Stream a generated dataset to ``path`` and return the number of rows written.
+
+    The file holds exactly the rows ``generate_dataset`` would return for
+    the same arguments. ``progress`` is called with the running row count
+    after each chunk is written; an exception it raises stops the export.
+    ``n_workers`` processes generate blocks ahead of the writer without
+    changing the output. Passing an ``accumulator`` (see
+    ``construct_accumulator``) collects the item moments of every chunk on
+    the way to disk. ``id_rows`` sizes the ID dtype (see
+    ``iter_dataset_chunks``).
+    """
+    fmt = fmt or infer_format(path)
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}'; expected one of {STREAM_FORMATS}")
+
+    generated = iter_dataset_chunks(variables, relationships, sample_size, seed, chunk_size=chunk_size,
+                                    noise=noise, n_workers=n_workers,
+                                    moderators=moderators, mediators=mediators, model=model, calibrate=calibrate,
+                                    responses=responses, id_rows=id_rows)
+    chunks = generated if accumulator is None else _accumulated(generated, variables, accumulator)
+    progress = progress or (lambda rows: None)
+    # An exception from progress (or a writer) also stops the block workers
+    with closing(generated):
+        if fmt == 'csv':
+            return _write_csv(path, chunks, progress)
+        if fmt == 'parquet':
+            return _write_parquet(path, chunks, progress)
+        if fmt == 'feather':
+            return _write_feather(path, chunks, progress)
+        return _write_npy(path, chunks, progress, shape=(sample_size, len(item_columns(variables))),
+                          dtype=MISSING_ITEM_DTYPE if has_missing(responses) else ITEM_DTYPE)
@@ -0,0 +1,145 @@
+import itertools
+import json
+import re
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pandas as pd
+
+from components.api import generate_to_file, normalize_config
+from components.cache import config_hash
+from components.parallel import imap_ordered
+
+# ===============================================================
+# 🧪 Parameter Sweeps into a Partitioned Dataset
+# ---------------------------------------------------------------
+# Expands a base model config over a grid (sample sizes, seeds,
+# path coefficients, …) and writes every cell as one partition of
+# a hive-style dataset: out/sample_size=500/coefficient=0.3/…
+# Cells that differ only in N or seed form one task, so a worker
+# compiles the model, covariance factor and thresholds once per
+# group and reuses them from its caches for the rest.
+# ===============================================================
+
+SWEEP_FORMATS = ('parquet', 'feather', 'csv')
+SWEEP_MANIFEST = '_sweep.json'
+
+# Grid keys that set a top-level config value
+CONFIG_PARAMETERS = ('sample_size', 'seed', 'model', 'calibrate')
+# 'coefficient' sets every path; 'coefficient:FROM->TO' a single one
+PATH_PARAMETER = re.compile(r'^coefficient(?::(?P<src>.+?)->(?P<dst>.+))?$')
+
+# Parameters that leave the compiled model (and its caches) unchanged
+SAMPLING_PARAMETERS = ('sample_size', 'seed')
+
+
+def expand_grid(grid):
+    """Every combination of the grid values, as a list of parameter dicts."""
+    for key in grid:
+        if key not in CONFIG_PARAMETERS and not PATH_PARAMETER.match(key):
+            raise ValueError(f"Unknown sweep parameter '{key}'; expected one of {CONFIG_PARAMETERS}, "
+                             "'coefficient' or 'coefficient:FROM->TO'")
+    keys = list(grid)
+    values = [grid[key] if isinstance(grid[key], (list, tuple)) else [grid[key]] for key in keys]
+    return [dict(zip(keys, combination)) for combination in itertools.product(*values)]
+
+
+def cell_config(config, params):
+    """The base ``config`` with one grid cell's parameters applied."""
+    cell = normalize_config(config)
+    for key, value in params.items():
+        if key in CONFIG_PARAMETERS:
+            cell[key] = value
+            continue
+        match = PATH_PARAMETER.match(key)
+        paths = [
+            rel for rel in cell['relationships']
+            if match['src'] is None or (rel['from'], rel['to']) == (match['src'], match['dst'])
+        ]
+        if not paths:
+            raise ValueError(f"Sweep parameter '{key}' matches no relationship in the config")
+        for rel in paths:
+            rel['coefficient'] = float(value)
+    return normalize_config(cell)
+
+
+def partition_column(key):
+    """Partition column name of a grid key, e.g. ``coefficient:PE->ATT`` → ``coefficient_PE_ATT``."""
+    return re.sub(r'\W+', '_', key).strip('_')
+
+
+def partition_path(params):
+    """Relative hive-style directory of a grid cell."""
+    return Path(*(f"{partition_column(key)}={value}" for key, value in params.items()))
+
+
+def _run_cells(cells, out_dir, fmt, chunk_size, id_rows):
+    records = []
+    for params, config in cells:
+        directory = Path(out_dir) / partition_path(params)
+        directory.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        rows = generate_to_file(config, directory / f'part-0.{fmt}', fmt=fmt, chunk_size=chunk_size,
+                                id_rows=id_rows)
+        records.append({
+            **{partition_column(key): value for key, value in params.items()},
+            'path': str(partition_path(params)),
+            'rows': rows,
+            'seconds': round(time.perf_counter() - started, 3),
+        })
+    return records
+
+
+def sweep_tasks(cells, n_workers=1):
+    """Group cells that share a model into tasks, split further to feed ``n_workers``.
+
+    In-process sweeps share the model caches anyway and run one cell per
+    task, so progress (and cancellation) is per cell.
+    """
+    if n_workers <= 1:
+        return [[cell] for cell in cells]
+    groups = {}
+    for params, config in cells:
+        model_key = config_hash({k: v for k, v in config.items() if k not in SAMPLING_PARAMETERS})
+        groups.setdefault(model_key, []).append((params, config))
+
+    parts = max(1, -(-n_workers // len(groups))) if groups else 1
+    tasks = []
+    for group in groups.values():
+        size = -(-len(group) // parts)
+        tasks += [group[start:start + size] for start in range(0, len(group), size)]
+    return tasks
+
+
+def run_sweep(config, grid, out_dir, fmt='parquet', n_workers=1, chunk_size=None, progress=None):
+    """Generate every grid cell of ``config`` into a partitioned dataset under ``out_dir``.
+
+    Each cell is streamed to ``<out_dir>/<key=value>/…/part-0.<fmt>``;
+    read the result back with e.g. ``pyarrow.dataset.dataset(out_dir,
+    partitioning='hive')``. A ``_sweep.json`` manifest records the base
+    config, the grid and every cell. ``progress`` is called with
+    ``(cells done, total cells)``; an exception it raises stops the sweep,
+    keeping the cells written so far but no manifest. Returns the cells
+    as a DataFrame.
+    """
+    if fmt not in SWEEP_FORMATS:
+        raise ValueError(f"Unsupported sweep format '{fmt}'; expected one of {SWEEP_FORMATS}")
+    config = normalize_config(config)
+    cells = [(params, cell_config(config, params)) for params in expand_grid(grid)]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # One ID dtype for every partition, wide enough for the largest cell
+    id_rows = max((cell['sample_size'] for _, cell in cells), default=0)
+    tasks = [(task, str(out_dir), fmt, chunk_size, id_rows) for task in sweep_tasks(cells, n_workers)]
+    records = []
+    with closing(imap_ordered(_run_cells, tasks, n_workers)) as results:
+        for task_records in results:
+            records += task_records
+            if progress:
+                progress(len(records), len(cells))
+
+    manifest = {'config': config, 'grid': grid, 'format': fmt, 'cells': records}
+    (out_dir / SWEEP_MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return pd.DataFrame(records)
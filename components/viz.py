@@ -0,0 +1,271 @@
+import numpy as np
+
+from components.cache import LRUCache, config_hash
+from components.generator import LIKERT_MAX, LIKERT_MIN, item_columns, reverse_columns
+from components.psychometrics import STATS_CHUNK_ROWS, construct_layout
+
+# ===============================================================
+# 📈 Scalable Visualization
+# ---------------------------------------------------------------
+# Every figure is reduced on the server before it reaches the
+# browser: histograms are Likert level counts, box plots carry
+# precomputed quartiles, large scatter plots become 2-D bin counts
+# and the correlation heatmap is construct-level with item-level
+# drill-down. Figures are cached per dataset version, so widget
+# changes that revisit a chart do not rebuild it.
+# ===============================================================
+
+# Raw points sent as a WebGL scatter; larger samples are binned
+SCATTER_POINT_LIMIT = 20_000
+SCATTER_BINS = 40
+# Largest heatmap whose cells are labelled with their values
+ANNOTATION_LIMIT = 20
+
+
+def figure_size(fig):
+    """Size of a figure as sent to the browser (its JSON), in bytes."""
+    return len(fig.to_json())
+
+
+FIGURE_CACHE = LRUCache(max_entries=128, max_bytes=64 * 1024 ** 2, sizer=figure_size)
+
+
+def construct_columns(variables):
+    """Item column names of every construct, ``{name: [columns]}``."""
+    columns = item_columns(variables)
+    _, counts = construct_layout(variables)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return {v['name']: columns[s:s + k] for v, s, k in zip(variables, starts, counts)}
+
+
+def answered_rows(df, columns):
+    """Mask of the rows with a response in every one of ``columns``, or ``None`` if nothing is missing."""
+    values = df[list(columns)].to_numpy()
+    if values.dtype.kind != 'f':
+        return None
+    answered = ~np.isnan(values).any(axis=1)
+    return None if answered.all() else answered
+
+
+def construct_sums(df, variables, chunk_rows=STATS_CHUNK_ROWS):
+    """Per-respondent item sums of every construct (int32, n × constructs).
+
+    Sums stay integers, so their distributions can be counted exactly;
+    the construct score is ``sum / items``. Each row chunk is summed with
+    one matmul against the item → construct indicator matrix, after
+    re-keying reverse-keyed items. Also returns the (n × constructs) mask
+    of respondents who answered all of a construct's items, or ``None``
+    if nothing is missing; other sums are 0.
+    """
+    items = df[item_columns(variables)].to_numpy()
+    reverse = reverse_columns(variables)
+    _, counts = construct_layout(variables)
+    indicator = np.repeat(np.eye(len(counts), dtype=np.float32), counts, axis=0)
+    sums = np.empty((len(items), len(counts)), dtype=np.int32)
+    answered = np.ones(sums.shape, dtype=bool) if items.dtype.kind == 'f' else None
+    for start in range(0, len(items), chunk_rows):
+        chunk = items[start:start + chunk_rows].astype(np.float32)
+        if reverse:
+            chunk[:, reverse] = LIKERT_MIN + LIKERT_MAX - chunk[:, reverse]
+        if answered is not None:
+            missing = np.isnan(chunk)
+            chunk[missing] = 0
+            answered[start:start + chunk_rows] = missing @ indicator == 0
+        sums[start:start + chunk_rows] = chunk @ indicator
+    if answered is not None:
+        if answered.all():
+            answered = None
+        else:
+            sums[~answered] = 0
+    return sums, answered
+
+
+def source_columns(variables, column):
+    """Item columns behind an item or construct column."""
+    return construct_columns(variables).get(column, [column])
+
+
+def column_values(df, variables, column, rows=None):
+    """Integer values of an item or construct column plus the divisor that
+    turns them into scores (1 for items, item count for constructs).
+
+    Construct values are item sums with reverse-keyed items re-keyed.
+    ``rows`` (a boolean mask) selects respondents, e.g. those who
+    answered every item involved (see ``answered_rows``).
+    """
+    columns = source_columns(variables, column)
+    values = df[columns].to_numpy()
+    if rows is not None:
+        values = values[rows]
+    if column not in construct_columns(variables):
+        return values[:, 0].astype(np.int32, copy=False), 1
+    position = {col: j for j, col in enumerate(item_columns(variables))}
+    flip = np.isin([position[col] for col in columns], reverse_columns(variables))
+    if flip.any():
+        values = np.where(flip, LIKERT_MIN + LIKERT_MAX - values, values)
+    return values.sum(axis=1, dtype=np.int32), len(columns)
+
+
+def value_counts(values, divisor=1):
+    """Exact distribution of integer ``values`` via ``np.bincount``.
+
+    Returns score levels (``values / divisor``) and their counts, from the
+    lowest to the highest attainable value on the Likert range.
+    """
+    low, high = LIKERT_MIN * divisor, LIKERT_MAX * divisor
+    counts = np.bincount(values - low, minlength=high - low + 1)
+    return np.arange(low, high + 1) / divisor, counts
+
+
+def quartiles_from_counts(levels, counts):
+    """Box plot statistics of a discrete distribution given by level counts."""
+    cumulative = np.cumsum(counts) / counts.sum()
+    q1, median, q3 = (levels[np.searchsorted(cumulative, q)] for q in (0.25, 0.5, 0.75))
+    observed = levels[counts > 0]
+    iqr = q3 - q1
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'mean': counts @ levels / counts.sum(),
+        'lowerfence': observed[observed >= q1 - 1.5 * iqr].min(),
+        'upperfence': observed[observed <= q3 + 1.5 * iqr].max(),
+    }
+
+
+def correlation_from_values(values, answered=None):
+    """Pearson correlation matrix of the (n × columns) value matrix.
+
+    With an ``answered`` mask of the same shape, every pair of columns is
+    correlated over the rows that answered both (pairwise complete cases).
+    """
+    values = np.asarray(values, dtype=float)
+    if answered is None:
+        centered = values - values.mean(axis=0)
+        cov = centered.T @ centered
+        scale = 1 / np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore'):
+            return cov * scale[:, None] * scale[None, :]
+
+    mask = answered.astype(float)
+    values = np.where(answered, values, 0.0)
+    n = mask.T @ mask
+    sums = values.T @ mask
+    squares = (values ** 2).T @ mask
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = values.T @ values - sums * sums.T / n
+        var = squares - sums ** 2 / n
+        return cov / np.sqrt(var * var.T)
+
+
+def style_figure(fig):
+    """Publication styling shared by all dashboard figures."""
+    fig.update_layout(
+        title_x=0.5,
+        title_font=dict(size=20),
+        font=dict(family="Times New Roman", size=14),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        margin=dict(l=40, r=40, t=80, b=40)
+    )
+    return fig
+
+
+def histogram_figure(df, variables, column):
+    import plotly.graph_objects as go
+
+    rows = answered_rows(df, source_columns(variables, column))
+    levels, counts = value_counts(*column_values(df, variables, column, rows))
+    fig = go.Figure(go.Bar(x=levels, y=counts, name=column))
+    fig.update_layout(title=f"Distribution of {column}", xaxis_title=column, yaxis_title="count", bargap=0.1)
+    return fig
+
+
+def box_figure(df, variables, column):
+    import plotly.graph_objects as go
+
+    rows = answered_rows(df, source_columns(variables, column))
+    stats = quartiles_from_counts(*value_counts(*column_values(df, variables, column, rows)))
+    fig = go.Figure(go.Box(name=column, boxpoints=False, **{key: [value] for key, value in stats.items()}))
+    fig.update_layout(title=f"Box Plot of {column}")
+    return fig
+
+
+def scatter_figure(df, variables, x_col, y_col):
+    """WebGL scatter up to ``SCATTER_POINT_LIMIT`` rows, 2-D bin counts beyond."""
+    import plotly.graph_objects as go
+
+    rows = answered_rows(df, source_columns(variables, x_col) + source_columns(variables, y_col))
+    x_values, x_div = column_values(df, variables, x_col, rows)
+    y_values, y_div = column_values(df, variables, y_col, rows)
+    title = f"{x_col} vs {y_col}"
+
+    if len(x_values) <= SCATTER_POINT_LIMIT:
+        fig = go.Figure(go.Scattergl(x=x_values / x_div, y=y_values / y_div, mode='markers',
+                                     marker=dict(size=5, opacity=0.4)))
+    else:
+        # Likert scores are discrete: one bin per attainable value when they fit
+        bins, ranges = [], []
+        for divisor in (x_div, y_div):
+            levels = (LIKERT_MAX - LIKERT_MIN) * divisor + 1
+            bins.append(min(levels, SCATTER_BINS))
+            ranges.append((LIKERT_MIN - 0.5 / divisor, LIKERT_MAX + 0.5 / divisor))
+        counts, x_edges, y_edges = np.histogram2d(x_values / x_div, y_values / y_div, bins=bins, range=ranges)
+        fig = go.Figure(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=np.where(counts > 0, counts, np.nan).T, colorscale="Blues", colorbar=dict(title="count")
+        ))
+        title += f" (binned, n = {len(x_values):,})"
+    fig.update_layout(title=title, xaxis_title=x_col, yaxis_title=y_col)
+    return fig
+
+
+def heatmap_figure(df, variables, constructs=()):
+    """Construct-level correlation heatmap, or the item-level correlations of
+    the selected ``constructs`` when any are given (drill-down)."""
+    import plotly.graph_objects as go
+
+    if constructs:
+        groups = construct_columns(variables)
+        labels = [col for name in constructs for col in groups[name]]
+        values = df[labels].to_numpy()
+        answered = ~np.isnan(values) if values.dtype.kind == 'f' else None
+        corr = correlation_from_values(values, answered)
+        title = "Item Correlations: " + ", ".join(constructs)
+    else:
+        labels = [v['name'] for v in variables]
+        corr = correlation_from_values(*construct_sums(df, variables))
+        title = "Construct Correlation Heatmap"
+
+    corr = np.round(corr, 2)
+    annotate = len(labels) <= ANNOTATION_LIMIT
+    fig = go.Figure(go.Heatmap(
+        z=corr, x=labels, y=labels, colorscale="Blues",
+        text=corr if annotate else None, texttemplate="%{text}" if annotate else None
+    ))
+    size = min(max(400, 40 * len(labels)), 900)
+    fig.update_layout(title=title, xaxis=dict(tickangle=45), yaxis=dict(autorange="reversed"),
+                      width=size + 100, height=size)
+    return fig
+
+
+FIGURE_BUILDERS = {
+    'histogram': histogram_figure,
+    'box': box_figure,
+    'scatter': scatter_figure,
+    'heatmap': heatmap_figure,
+}
+
+
+def dashboard_figure(df, variables, kind, *args, version=None, cache=FIGURE_CACHE):
+    """Styled dashboard figure, cached on ``version`` (the dataset config hash).
+
+    Cached figures are shared between sessions and must not be modified.
+    """
+    def build():
+        return style_figure(FIGURE_BUILDERS[kind](df, variables, *args))
+
+    if cache is None or version is None:
+        return build()
+    key = config_hash({'version': version, 'figure': kind, 'args': args})
+    return cache.get_or_compute(key, build)